@@ -153,6 +153,11 @@ class ConfigManager:
                 f.write("# OTTOEJECT CONFIGURATION\n")
                 f.write(f"OTTOEJECT_IP={merged_config.get('OTTOEJECT_IP', '')}\n")
                 
+                # Write optional status poll tuning
+                for poll_key in ('POLL_BACKOFF_MIN', 'POLL_BACKOFF_MAX'):
+                    if poll_key in merged_config:
+                        f.write(f"{poll_key}={merged_config[poll_key]}\n")
+                
                 # Write current macros (from active profile)
                 current_profile = merged_config.get('CURRENT_PRINTER_PROFILE')
                 if current_profile:
@@ -15,6 +15,7 @@ sys.path.insert(0, str(SCRIPT_DIR))
 from config.config_manager import ConfigManager
 from ui import (
     display_welcome, 
+    display_welcome_with_scroll_message,
     display_main_menu, 
     get_menu_choice,
     get_printer_choice,
@@ -418,7 +419,7 @@ def main():
             # Redisplay ASCII art after configuration is saved for choices 1, 2, 3
             if choice in ["1", "2", "3"]:
                 input("\nPress ENTER to continue...")
-                display_welcome(show_scroll_message=True)
+                display_welcome_with_scroll_message()
         
         # Only start automation for choices 3 and 4 (Start New Jobs and Start Last Jobs)
         if choice in ["3", "4"]:
@@ -5,7 +5,7 @@ Handles communication with the OttoEject mechanical arm via Moonraker API
 
 import time
 import requests
-from utils.logger import setup_logger, StatusLogger
+from utils.logger import setup_logger, get_status_logger
 
 class OttoEjectController:
     """Controller for OttoEject mechanical arm"""
@@ -22,7 +22,7 @@ class OttoEjectController:
         self.port = port
         self.base_url = f"http://{ip_address}:{port}"
         self.logger = setup_logger()
-        self.status_logger = StatusLogger()
+        self.status_logger = get_status_logger()
         
         # Timeout settings
         self.command_timeout = 30  # Timeout for sending commands (avoid proxy 504 errors)
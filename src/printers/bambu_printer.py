@@ -6,7 +6,7 @@ Handles communication with Bambu Lab printers via MQTT
 import time
 import logging
 import bambulabs_api as bl_api
-from printers.printer_factory import BasePrinter, PrinterStatusTracker, calculate_poll_interval, is_completion_state, is_error_state
+from printers.printer_factory import BasePrinter, PrinterStatusTracker, is_completion_state, is_error_state
 
 # SSL Warning Suppression Filter for X1C Handshake Issues
 class SSLHandshakeWarningFilter(logging.Filter):
@@ -503,9 +503,9 @@ class BambuLabPrinter(BasePrinter):
                 return False
             
             # Calculate next poll interval
-            poll_interval = calculate_poll_interval(remaining_time)
+            poll_interval = self.get_poll_interval(remaining_time)
             
-            self.logger.info(f"Next status check in {poll_interval} seconds...")
+            self.logger.info(f"Next status check in {poll_interval:.0f} seconds...")
             time.sleep(poll_interval)
     
     def needs_bed_positioning(self):
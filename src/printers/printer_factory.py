@@ -4,8 +4,17 @@ Provides unified interface for different printer brands
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import bisect
+import random
 import time
-from utils.logger import setup_logger, StatusLogger
+from utils.logger import setup_logger, get_status_logger
+
+# Poll interval bounds (seconds) for wait_for_completion loops, overridable with
+# POLL_BACKOFF_MIN / POLL_BACKOFF_MAX in config.txt
+DEFAULT_POLL_MIN = 2
+DEFAULT_POLL_MAX = 60
+POLL_JITTER_FRACTION = 0.1
 
 class BasePrinter(ABC):
     """Abstract base class for all printer implementations"""
@@ -19,7 +28,7 @@ class BasePrinter(ABC):
         """
         self.config = config_data
         self.logger = setup_logger()
-        self.status_logger = StatusLogger()
+        self.status_logger = get_status_logger()
         self.ip_address = config_data.get('PRINTER_IP')
         self.brand = config_data.get('PRINTER_BRAND')
         
@@ -30,6 +39,35 @@ class BasePrinter(ABC):
         
         # Special handling for first job (Bambu Lab specific but available to all)
         self.first_job_wait_seconds = 0
+        
+        # Status poll bounds (user tunable)
+        self.poll_min, self.poll_max = self._read_poll_bounds(config_data)
+    
+    def _read_poll_bounds(self, config_data):
+        """
+        Read POLL_BACKOFF_MIN / POLL_BACKOFF_MAX from the config
+        
+        A value that is not a number, not positive, or a minimum above the
+        maximum falls back to the defaults with a warning, so a typo in
+        config.txt cannot stop the printer from being created.
+        
+        Returns:
+            tuple: (poll_min, poll_max) in seconds
+        """
+        try:
+            poll_min = float(config_data.get('POLL_BACKOFF_MIN', DEFAULT_POLL_MIN))
+            poll_max = float(config_data.get('POLL_BACKOFF_MAX', DEFAULT_POLL_MAX))
+        except (TypeError, ValueError):
+            poll_min = poll_max = None
+        
+        if poll_min is None or not 0 < poll_min <= poll_max:
+            self.logger.warning(
+                f"⚠️  Invalid POLL_BACKOFF_MIN/POLL_BACKOFF_MAX in config - "
+                f"using defaults ({DEFAULT_POLL_MIN}-{DEFAULT_POLL_MAX}s)"
+            )
+            return DEFAULT_POLL_MIN, DEFAULT_POLL_MAX
+        
+        return poll_min, poll_max
     
     @abstractmethod
     def test_connection(self):
@@ -72,6 +110,21 @@ class BasePrinter(ABC):
         self.logger.info("Bed positioning not implemented for this printer type")
         return True
     
+    def get_poll_interval(self, remaining_time_minutes=None, progress_percent=None):
+        """
+        Get the next status poll interval for this printer
+        
+        Clamps calculate_poll_interval() to the configured bounds and adds a
+        small random jitter so several pollers don't hit a printer in lockstep.
+        
+        Returns:
+            float: Poll interval in seconds
+        """
+        interval = calculate_poll_interval(remaining_time_minutes, progress_percent)
+        interval = min(max(interval, self.poll_min), self.poll_max)
+        jitter = POLL_JITTER_FRACTION * interval
+        return interval + random.uniform(-jitter, jitter)
+    
     def _log_status(self, status_data, context=""):
         """Helper method to log printer status"""
         if context:
@@ -81,6 +134,33 @@ class BasePrinter(ABC):
         
         self.status_logger.log_printer_status(f"{self.brand}{context_msg}", status_data)
 
+@dataclass(slots=True)
+class PrinterStatus:
+    """Snapshot of printer state returned by get_status()"""
+    status: str
+    bed_temp: float = 0
+    nozzle_temp: float = 0
+    bed_target: float = 0
+    nozzle_target: float = 0
+    current_file: str = 'N/A'
+    progress_percent: float = 0
+    remaining_time_minutes: float = None
+    job_active: bool = False
+    job_id: int = None
+    is_complete: bool = False
+    is_error: bool = False
+    
+    # Dict-style access so shared helpers (StatusLogger, PrinterStatusTracker)
+    # accept both this and the plain status dicts other brands still return
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def __getitem__(self, key):
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return hasattr(self, key)
+
 class PrinterFactory:
     """Factory class to create appropriate printer instances"""
     
@@ -132,6 +212,10 @@ class PrinterFactory:
 
 # Common utility functions for printer implementations
 
+# Poll interval lookup keyed on remaining minutes: <=0 -> 5s, <=2 -> 10s, <=10 -> 30s, else 60s
+_TIME_THRESHOLDS = (0, 2, 10)
+_TIME_INTERVALS = (5, 10, 30, 60)
+
 def calculate_poll_interval(remaining_time_minutes=None, progress_percent=None):
     """
     Calculate appropriate polling interval based on print status
@@ -145,12 +229,7 @@ def calculate_poll_interval(remaining_time_minutes=None, progress_percent=None):
     """
     # Base interval on remaining time if available
     if remaining_time_minutes is not None:
-        if remaining_time_minutes > 10:
-            return 60  # 1 minute for long prints
-        elif remaining_time_minutes > 2:
-            return 30  # 30 seconds for medium prints
-        elif remaining_time_minutes >= 0:
-            return 10  # 10 seconds for final stages
+        return _TIME_INTERVALS[bisect.bisect_left(_TIME_THRESHOLDS, remaining_time_minutes)]
     
     # Base interval on progress if time not available
     if progress_percent is not None:
@@ -164,6 +243,42 @@ def calculate_poll_interval(remaining_time_minutes=None, progress_percent=None):
     # Default interval
     return 30
 
+# Printer state strings grouped by meaning (upper-case)
+COMPLETION_STATES = frozenset({
+    "FINISH", "FINISHED", "COMPLETE", "COMPLETED", "DONE"
+})
+
+ERROR_STATES = frozenset({
+    "ERROR", "FAILED", "FAULT", "PAUSED", "STOPPED", 
+    "ATTENTION", "CRITICAL", "OFFLINE"
+})
+
+# Small integer state codes used by PrinterStatusTracker
+STATE_UNKNOWN = 0
+STATE_COMPLETE = 1
+STATE_ERROR = 2
+STATE_PRINTING = 3
+STATE_IDLE = 4
+
+_STATE_CODES = {
+    **{state: STATE_COMPLETE for state in COMPLETION_STATES},
+    **{state: STATE_ERROR for state in ERROR_STATES},
+    "PRINTING": STATE_PRINTING,
+    "IDLE": STATE_IDLE,
+}
+
+def classify_state(state_str):
+    """
+    Map an upper-case state string to a small integer state code
+    
+    Args:
+        state_str: Upper-case state string from printer
+    
+    Returns:
+        int: One of the STATE_* codes (STATE_UNKNOWN if unrecognised)
+    """
+    return _STATE_CODES.get(state_str, STATE_UNKNOWN)
+
 def is_completion_state(state_str, progress_percent=None):
     """
     Check if a state string indicates print completion
@@ -178,11 +293,7 @@ def is_completion_state(state_str, progress_percent=None):
     state_upper = state_str.upper()
     
     # Clear completion states
-    completion_states = [
-        "FINISH", "FINISHED", "COMPLETE", "COMPLETED", "DONE"
-    ]
-    
-    if state_upper in completion_states:
+    if state_upper in COMPLETION_STATES:
         return True
     
     # IDLE with high progress typically means completion
@@ -201,14 +312,7 @@ def is_error_state(state_str):
     Returns:
         bool: True if state indicates error
     """
-    state_upper = state_str.upper()
-    
-    error_states = [
-        "ERROR", "FAILED", "FAULT", "PAUSED", "STOPPED", 
-        "ATTENTION", "CRITICAL", "OFFLINE"
-    ]
-    
-    return state_upper in error_states
+    return state_str.upper() in ERROR_STATES
 
 def format_time_remaining(minutes):
     """
@@ -235,11 +339,17 @@ def format_time_remaining(minutes):
 class PrinterStatusTracker:
     """Helper class to track printer status changes"""
     
+    __slots__ = ('last_status', 'last_progress', 'idle_low_progress_count',
+                 'status_unchanged_count', '_analysis')
+    
     def __init__(self):
-        self.last_status = None
-        self.last_progress = None
-        self.idle_low_progress_count = 0
-        self.status_unchanged_count = 0
+        self._analysis = {
+            'status_changed': False,
+            'progress_changed': False,
+            'potential_issue': False,
+            'issue_description': None
+        }
+        self.reset()
     
     def update(self, status_data):
         """
@@ -249,20 +359,21 @@ class PrinterStatusTracker:
             status_data: Current status data from printer
         
         Returns:
-            dict: Analysis of status change
+            dict: Analysis of status change (reused between calls - read it before the next update)
         """
         current_status = status_data.get('status', status_data.get('state', 'UNKNOWN')).upper()
+        current_code = classify_state(current_status)
         current_progress = status_data.get('progress', status_data.get('progress_percent', 0))
         
-        analysis = {
-            'status_changed': current_status != self.last_status,
-            'progress_changed': current_progress != self.last_progress,
-            'potential_issue': False,
-            'issue_description': None
-        }
+        analysis = self._analysis
+        # Compare the raw state, not its code - PAUSED -> ERROR is still a change
+        analysis['status_changed'] = current_status != self.last_status
+        analysis['progress_changed'] = current_progress != self.last_progress
+        analysis['potential_issue'] = False
+        analysis['issue_description'] = None
         
         # Check for potential issues
-        if current_status == "IDLE" and current_progress is not None and current_progress < 10:
+        if current_code == STATE_IDLE and current_progress is not None and current_progress < 10:
             self.idle_low_progress_count += 1
             if self.idle_low_progress_count > 6:
                 analysis['potential_issue'] = True
@@ -271,9 +382,9 @@ class PrinterStatusTracker:
             self.idle_low_progress_count = 0
         
         # Check for stuck status
-        if (current_status == self.last_status and 
-            current_progress == self.last_progress and 
-            current_status == "PRINTING"):
+        if (current_code == STATE_PRINTING and
+            current_status == self.last_status and 
+            current_progress == self.last_progress):
             self.status_unchanged_count += 1
             if self.status_unchanged_count > 10:
                 analysis['potential_issue'] = True
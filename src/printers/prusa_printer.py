@@ -4,10 +4,33 @@ Handles communication with Prusa printers via PrusaLinkPy library
 """
 
 import time
-import PrusaLinkPy
-import requests
+import random
+import socket
 import json
-from printers.printer_factory import BasePrinter, PrinterStatusTracker, calculate_poll_interval, is_completion_state, is_error_state
+import queue
+import threading
+from printers.printer_factory import BasePrinter, PrinterStatus, PrinterStatusTracker, calculate_poll_interval, is_completion_state, is_error_state
+
+# Status retry backoff (seconds): base delay doubles per failed poll, capped
+STATUS_RETRY_BASE_DELAY = 0.5
+STATUS_RETRY_MAX_DELAY = 30
+# Longest retry sleep while the printer still accepts connections (seconds)
+STATUS_RETRY_REACHABLE_DELAY = 2.0
+# How long status polls may keep failing before the wait is aborted (seconds)
+STATUS_RETRY_BUDGET = 60
+
+# PrusaLink states that end the monitored job
+_COMPLETION_STATES = frozenset({"FINISHED"})
+_ERROR_STATES = frozenset({"ERROR", "ATTENTION", "STOPPED"})
+
+# Bed positioning detection (seconds / mm)
+POSITIONING_TIMEOUT = 30
+POSITIONING_FALLBACK_DELAY = 15
+POSITIONING_TOLERANCE_MM = 0.5
+
+# PrusaLink push endpoint used to wake the monitor loop early (firmware dependent)
+EVENT_STREAM_PATH = "/api/v1/events"
+EVENT_STREAM_CONNECT_TIMEOUT = 5
 
 class PrusaPrinter(BasePrinter):
     """Prusa printer implementation using PrusaLinkPy library"""
@@ -23,6 +46,12 @@ class PrusaPrinter(BasePrinter):
         # PrusaLinkPy instance
         self.prusa_instance = None
         
+        # Optional server-sent event stream (see _start_event_stream)
+        self._session = None
+        self._event_response = None
+        self._event_thread = None
+        self._status_events = queue.Queue()
+        
         # Model-specific positioning settings
         if self.printer_model == 'Core One':
             # Core One is a Z-bed printer
@@ -37,6 +66,12 @@ class PrusaPrinter(BasePrinter):
             self.z_position_for_ejection = None
             self.positioning_file = "/usb/OTTOTEMP/Y_POS_DWELL.gcode"
         
+        # Positioning values never change after construction - resolve them once
+        self._bed_axis = "Z" if not self.is_sling_bed else "Y"
+        self._eject_position = self.z_position_for_ejection or self.y_position_for_ejection
+        self._axis_key = f"axis_{self._bed_axis.lower()}"
+        self._position_log = f"Preparing Prusa for ejection: Starting pre-uploaded {self._bed_axis}-positioning script ('{self.positioning_file}')..."
+        
         self.status_tracker = PrinterStatusTracker()
         
         bed_type = "sling bed (Y-axis)" if self.is_sling_bed else "Z-bed (Z-axis)"
@@ -49,6 +84,9 @@ class PrusaPrinter(BasePrinter):
         self.logger.info("Note: Ensure PrusaLink is ENABLED")
         
         try:
+            # Imported lazily so other brands never pay for PrusaLinkPy's import
+            import PrusaLinkPy
+            
             # Initialize PrusaLinkPy instance
             self.prusa_instance = PrusaLinkPy.PrusaLinkPy(self.ip_address, self.api_key)
             
@@ -59,6 +97,7 @@ class PrusaPrinter(BasePrinter):
                 version_data = version_response.json()
                 server_version = version_data.get('server', 'Unknown')
                 self.logger.info(f"✅ Successfully connected to PrusaLink server: {server_version}")
+                self._start_event_stream()
                 return True
             else:
                 status_code = version_response.status_code if version_response else "No Response"
@@ -70,6 +109,89 @@ class PrusaPrinter(BasePrinter):
             self.logger.error("Ensure PrusaLink is enabled and API key is correct")
             return False
     
+    def _start_event_stream(self):
+        """
+        Subscribe to PrusaLink's event stream if the firmware offers one
+        
+        Events only wake wait_for_completion early; status is still read over HTTP,
+        so printers without the endpoint simply keep plain polling. The stream is
+        opened on a daemon thread, so a server that accepts the connection but
+        never answers cannot hold up the caller.
+        """
+        if self._event_thread is not None and self._event_thread.is_alive():
+            return
+        
+        self._event_thread = threading.Thread(target=self._event_stream_worker, daemon=True)
+        self._event_thread.start()
+    
+    def _event_stream_worker(self):
+        """Background thread: open the event stream and push the arrival time of each event onto the status event queue"""
+        try:
+            import requests
+            
+            self._session = requests.Session()
+            # No read timeout - the stream may stay quiet for the length of a print
+            response = self._session.get(
+                f"http://{self.ip_address}{EVENT_STREAM_PATH}",
+                headers={"X-Api-Key": self.api_key, "Accept": "text/event-stream"},
+                stream=True,
+                timeout=(EVENT_STREAM_CONNECT_TIMEOUT, None)
+            )
+        except Exception as e:
+            self.logger.debug(f"PrusaLink event stream unavailable: {e}")
+            return
+        
+        if response.status_code != 200 or "text/event-stream" not in response.headers.get("Content-Type", ""):
+            self.logger.debug(f"PrusaLink event stream not supported (HTTP {response.status_code}) - using polling")
+            response.close()
+            self._session.close()
+            self._session = None
+            return
+        
+        self._event_response = response
+        self.logger.info("Subscribed to PrusaLink event stream - status changes will be picked up immediately")
+        
+        try:
+            # chunk_size=1 hands each line over as soon as it arrives instead of
+            # waiting for a 512-byte chunk to fill
+            for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+                if line and line.startswith("data:"):
+                    self._status_events.put(time.monotonic())
+        except Exception as e:
+            self.logger.debug(f"PrusaLink event stream closed: {e}")
+        finally:
+            if self._event_response is response:
+                self._event_response = None
+    
+    def _wait_for_status_event(self, timeout, since):
+        """
+        Sleep up to timeout seconds, returning early if the printer pushes an event
+        
+        Args:
+            timeout: Longest time to wait (seconds)
+            since: time.monotonic() of the last status poll; events queued before
+                it are already reflected in that status and are discarded
+        """
+        if self._event_response is None:
+            time.sleep(timeout)
+            return
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event_time = self._status_events.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if event_time >= since:
+                break
+        
+        # Collapse a burst of events into a single wake-up
+        while not self._status_events.empty():
+            self._status_events.get_nowait()
+    
     def get_status(self):
         """Get current printer status using PrusaLinkPy"""
         if not self.prusa_instance:
@@ -99,7 +221,7 @@ class PrusaPrinter(BasePrinter):
             current_file = "N/A"
             progress_percent = 0
             remaining_time_minutes = None
-            job_active = False
+            job_id = None
             
             if job_info:
                 current_file = job_info.get('file', {}).get('name', 'N/A') if job_info.get('file') else 'N/A'
@@ -107,25 +229,24 @@ class PrusaPrinter(BasePrinter):
                 progress_percent = job_info.get('progress', 0) or 0
                 remaining_time_seconds = job_info.get('time_remaining')
                 job_id = job_info.get('id')
-                job_active = job_id is not None
                 
                 if remaining_time_seconds:
                     remaining_time_minutes = remaining_time_seconds / 60
             
-            # Build status response
-            status_response = {
-                'status': state,
-                'bed_temp': bed_temp,
-                'nozzle_temp': nozzle_temp,
-                'bed_target': 0,  # PrusaLink doesn't always provide targets
-                'nozzle_target': 0,
-                'current_file': current_file,
-                'progress_percent': progress_percent,
-                'remaining_time_minutes': remaining_time_minutes,
-                'job_active': job_active
-            }
-            
-            return status_response
+            # PrusaLink doesn't always provide temperature targets, so those keep their defaults.
+            # Completion/error are classified here while the state is at hand so callers don't re-scan it
+            return PrinterStatus(
+                status=state,
+                bed_temp=bed_temp,
+                nozzle_temp=nozzle_temp,
+                current_file=current_file,
+                progress_percent=progress_percent,
+                remaining_time_minutes=remaining_time_minutes,
+                job_active=job_id is not None,
+                job_id=job_id,
+                is_complete=state in _COMPLETION_STATES,
+                is_error=state in _ERROR_STATES
+            )
             
         except Exception as e:
             self.logger.error(f"Error getting printer status: {e}")
@@ -177,105 +298,91 @@ class PrusaPrinter(BasePrinter):
         time.sleep(5)  # Initial delay
         
         consecutive_error_polls = 0
-        last_logged_status = ""
+        errors_since = None
+        last_logged_status = None
         initial_job_id_to_monitor = None
         
         # Try to get the ID of the job that just started
-        try:
-            status_data = self.get_status()
-            if status_data and status_data.get('job_active'):
-                # Get job ID from direct API call
-                status_response = self.prusa_instance.get_status()
-                if status_response and status_response.status_code == 200:
-                    job_data = status_response.json().get("job")
-                    if job_data and job_data.get("id") is not None:
-                        initial_job_id_to_monitor = job_data.get("id")
-                        self.logger.info(f"Now monitoring Job ID: {initial_job_id_to_monitor} for completion.")
-        except Exception:
+        status_data = self.get_status()
+        if status_data and status_data.job_id is not None:
+            initial_job_id_to_monitor = status_data.job_id
+            self.logger.info(f"Now monitoring Job ID: {initial_job_id_to_monitor} for completion.")
+        else:
             self.logger.warning("Could not immediately determine job ID being monitored.")
         
         while True:
+            polled_at = time.monotonic()
             status_data = self.get_status()
             
             if not status_data:
-                consecutive_error_polls += 1
-                if consecutive_error_polls > 4:
+                # Failures are budgeted by time, however short the retry sleeps get
+                now = time.monotonic()
+                if errors_since is None:
+                    errors_since = now
+                elif now - errors_since >= STATUS_RETRY_BUDGET:
                     self.logger.error("Too many status errors. Aborting wait.")
                     return False
-                self.logger.warning("Failed to get status, retrying...")
-                time.sleep(15)
+                
+                consecutive_error_polls += 1
+                backoff = min(STATUS_RETRY_MAX_DELAY, STATUS_RETRY_BASE_DELAY * (2 ** consecutive_error_polls))
+                backoff += random.uniform(0, 0.25 * backoff)
+                if self._is_reachable():
+                    # Printer still answers on the network - likely a blip, so only this sleep is shortened
+                    backoff = min(backoff, STATUS_RETRY_REACHABLE_DELAY)
+                backoff = min(backoff, max(0.0, errors_since + STATUS_RETRY_BUDGET - now))
+                self.logger.warning(f"Failed to get status, retrying in {backoff:.1f}s...")
+                time.sleep(backoff)
                 continue
             
             consecutive_error_polls = 0
+            errors_since = None
             
             # Extract status information
-            state = status_data['status']
-            progress = status_data.get('progress_percent', 0)
-            filename = status_data.get('current_file', 'N/A')
-            remaining_time = status_data.get('remaining_time_minutes')
-            job_active = status_data.get('job_active', False)
-            
-            # Create status line
-            time_str = f"{remaining_time:.1f} min" if remaining_time else "N/A"
-            current_status_line = (
-                f"State: {state} | Progress: {progress:.1f}% | File: {filename} | "
-                f"Remaining: {time_str} | Job Active: {job_active}"
-            )
-            
-            # Log only if status changed
-            if current_status_line != last_logged_status:
-                self.logger.info(current_status_line)
-                last_logged_status = current_status_line
+            status_key = (status_data.status, status_data.progress_percent, status_data.current_file,
+                          status_data.remaining_time_minutes, status_data.job_active)
+            state, progress, filename, remaining_time, job_active = status_key
             
-            # Get current job ID for comparison
-            current_job_id = None
-            try:
-                status_response = self.prusa_instance.get_status()
-                if status_response and status_response.status_code == 200:
-                    job_data = status_response.json().get("job")
-                    current_job_id = job_data.get("id") if job_data and job_data.get("id") is not None else None
-            except:
-                pass
-            
-            # Check for completion states (exact multifile loop logic)
-            if state == "FINISHED":
-                self.logger.info("✅ Print completed (FINISHED)")
-                return True
+            # Log only if status changed (one tuple compare before any formatting)
+            if status_key != last_logged_status:
+                time_str = f"{remaining_time:.1f} min" if remaining_time else "N/A"
+                self.logger.info(
+                    f"State: {state} | Progress: {progress:.1f}% | File: {filename} | "
+                    f"Remaining: {time_str} | Job Active: {job_active}"
+                )
+                last_logged_status = status_key
             
-            if state == "IDLE":
-                # If IDLE and no job, it's done
-                # If IDLE and job ID is different from what we were tracking, our job is done  
-                # If IDLE and job ID is same but progress is high, it's done
-                if (current_job_id is None or 
-                    (initial_job_id_to_monitor is not None and current_job_id != initial_job_id_to_monitor) or
-                    progress >= 99.0):
-                    self.logger.info("✅ Print completed (IDLE with job context indicating completion)")
-                    return True
+            current_job_id = status_data.job_id
             
             # Check for error states
-            if state in ["ERROR", "ATTENTION", "STOPPED"]:
+            if status_data.is_error:
                 self.logger.error(f"❌ Print failed - State: {state}")
                 return False
             
+            # Our job is done once the printer reports a different job (or none) than the one
+            # we started monitoring; completion states and IDLE at ~100% are fallbacks
+            job_changed = initial_job_id_to_monitor is not None and current_job_id != initial_job_id_to_monitor
+            if (status_data.is_complete or job_changed or
+                    (state == "IDLE" and (current_job_id is None or progress >= 99.0))):
+                self.logger.info(f"✅ Print completed ({state}{', job ID changed' if job_changed else ''})")
+                return True
+            
             # Capture job ID if not captured before
             if current_job_id is not None and initial_job_id_to_monitor is None:
                 initial_job_id_to_monitor = current_job_id
                 self.logger.info(f"Now monitoring newly detected job ID: {initial_job_id_to_monitor} for completion.")
             
-            # Calculate poll interval (exact multifile loop logic)
-            poll_interval = 30
-            if remaining_time is not None:
-                remaining_time_seconds = remaining_time * 60
-                if remaining_time_seconds > 600:
-                    poll_interval = 60
-                elif remaining_time_seconds > 120:
-                    poll_interval = 30
-                elif remaining_time_seconds > 0:
-                    poll_interval = 15
-                else:
-                    poll_interval = 5
+            # Calculate poll interval
+            poll_interval = self.get_poll_interval(remaining_time)
             
-            time.sleep(poll_interval)
+            self._wait_for_status_event(poll_interval, polled_at)
+    
+    def _is_reachable(self, port=80, timeout=1.0):
+        """Cheap TCP probe to check whether the PrusaLink web server is accepting connections"""
+        try:
+            with socket.create_connection((self.ip_address, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
     
     def needs_bed_positioning(self):
         """Prusa printers need bed positioning for ejection"""
@@ -288,10 +395,10 @@ class PrusaPrinter(BasePrinter):
             return False
         
         try:
-            bed_axis = "Z" if not self.is_sling_bed else "Y"
-            position = self.z_position_for_ejection if not self.is_sling_bed else self.y_position_for_ejection
+            bed_axis = self._bed_axis
+            position = self._eject_position
             
-            self.logger.info(f"Preparing Prusa for ejection: Starting pre-uploaded {bed_axis}-positioning script ('{self.positioning_file}')...")
+            self.logger.info(self._position_log)
             
             # Start the positioning file (exact multifile loop approach)
             response = self.prusa_instance.post_print_gcode(self.positioning_file)
@@ -303,9 +410,10 @@ class PrusaPrinter(BasePrinter):
             
             self.logger.info(f"✅ {bed_axis}-positioning script dispatched successfully")
             
-            # Wait for positioning script to get to dwell part (exact multifile loop timing)
+            # Wait for positioning script to get to dwell part
             self.logger.info("Waiting for positioning script to reach dwell...")
-            time.sleep(15)  # Wait for it to home and move to position
+            if not self._wait_for_bed_position(self._axis_key, position):
+                self.logger.warning(f"Bed did not report reaching {bed_axis}{position} within {POSITIONING_TIMEOUT}s - pausing anyway")
             
             # Pause the printer during dwell to lock bed position (exact multifile loop approach)  
             self.logger.info("Pausing printer to lock bed position...")
@@ -324,6 +432,64 @@ class PrusaPrinter(BasePrinter):
             self.logger.error(f"❌ Error positioning bed: {e}")
             return False
     
+    def _wait_for_bed_position(self, axis_key, target):
+        """
+        Poll PrusaLink until the bed reaches the ejection position
+        
+        Args:
+            axis_key: PrusaLink printer field to watch ('axis_y' or 'axis_z')
+            target: Target position in mm
+        
+        Returns:
+            bool: True if the position (or the end of the positioning job) was detected
+        """
+        start = time.monotonic()
+        deadline = start + POSITIONING_TIMEOUT
+        # The Y script homes before moving, so the bed must be seen away from the target first
+        departed = not self.is_sling_bed
+        # PAUSED/FINISHED only count once the positioning job has been seen running -
+        # right after dispatch the printer may still report the previous print's FINISHED
+        job_seen_running = False
+        poll_interval = 2.0
+        
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            
+            try:
+                response = self.prusa_instance.get_status()
+                if not response or response.status_code != 200:
+                    continue
+                printer_info = response.json().get("printer", {})
+            except Exception:
+                continue
+            
+            state = printer_info.get('state', '').upper()
+            if state in ("PAUSED", "FINISHED"):
+                if job_seen_running:
+                    return True
+            elif state != "IDLE":
+                job_seen_running = True
+            
+            position = printer_info.get(axis_key)
+            if position is None:
+                # Firmware doesn't report axis positions - fall back to the fixed delay
+                remaining = start + POSITIONING_FALLBACK_DELAY - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                return True
+            
+            distance = abs(position - target)
+            if distance <= POSITIONING_TOLERANCE_MM:
+                if departed:
+                    return True
+            else:
+                departed = True
+            
+            # Poll faster as the bed approaches the target
+            poll_interval = min(2.0, max(0.2, distance / 25))
+        
+        return False
+    
     def move_bed_for_ejection(self):
         """Move bed for ejection (main script compatibility method)"""
         return self.position_bed_for_ejection()
@@ -359,6 +525,12 @@ class PrusaPrinter(BasePrinter):
     
     def disconnect(self):
         """Disconnect from printer (cleanup method)"""
-        # PrusaLinkPy doesn't require explicit disconnection
+        # PrusaLinkPy doesn't require explicit disconnection; only the event stream needs closing
+        if self._event_response is not None:
+            self._event_response.close()
+            self._event_response = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         self.logger.info("Prusa printer disconnected")
         return True
\ No newline at end of file
@@ -16,6 +16,7 @@ from .printer_setup import (
 )
 
 from .job_setup import (
+    Job,
     setup_print_jobs,
     get_current_rack_state,
     validate_job_sequence,
@@ -27,6 +28,7 @@ __all__ = [
     'setup_printer_connection',
     'setup_ottoeject_config',
     'setup_ottoeject_macros_only',
+    'Job',
     'setup_print_jobs',
     'get_current_rack_state',
     'validate_job_sequence',
@@ -3,124 +3,188 @@ Job Setup Module for OTTOMAT3D
 Handles print job configuration and rack validation
 """
 
-from utils.rack_manager import RackManager
+import csv
+import functools
+import sys
+from dataclasses import dataclass
+from ui.display import emit, parse_yes_no, prompt_int, prompt_yes_no
+from ui.format import banner_print
 
-def setup_print_jobs(printer_brand=None, printer_model=None):
-    """Configure print jobs for automation sequence"""
-    print("\nPRINT JOB CONFIGURATION:")
-    print("─" * 30)
+# Rack slot display order (top slot first)
+_SLOTS_DESC = (6, 5, 4, 3, 2, 1)
+
+# Rack slot contents and status glyphs, built once and shared by every prompt
+_EMPTY = sys.intern("empty")
+_EXISTING_PLATE = {slot: sys.intern(f"existing_plate_slot_{slot}") for slot in range(1, 7)}
+_HAS_PLATE = "🟢 HAS PLATE"
+_NO_PLATE = "⬜ EMPTY"
+
+@dataclass(slots=True)
+class Job:
+    """A single print job; its job number is its 1-based position in the job list"""
+    filename: str
+    use_ams: bool = False
+    use_material_station: bool = False
+    store_slot: int = 0
+    grab_slot: int | None = None
+
+@functools.lru_cache(maxsize=64)
+def _rack_state_text(occupied):
+    """Rack state text for a tuple of has-plate flags ordered like _SLOTS_DESC"""
+    return "\n".join(
+        f"   Slot {slot}: {_HAS_PLATE if has_plate else _NO_PLATE}"
+        for slot, has_plate in zip(_SLOTS_DESC, occupied)
+    )
+
+def render_rack_state(current_rack_state):
+    """Render the rack state as one 'Slot N: ...' line per slot, top slot first"""
+    return _rack_state_text(tuple(current_rack_state[slot] != _EMPTY for slot in _SLOTS_DESC))
+
+def _parse_bulk_jobs(line, total_jobs, printer_brand=None, printer_model=None):
+    """
+    Parse a single-line bulk job entry
     
-    while True:
+    Jobs are separated by ';' and each is 'filename,store,grab[,flag]' where the
+    optional flag (y/n) is AMS for Bambu Lab or Material Station for FlashForge AD5X.
+    The grab slot may be left blank for the final job.
+    
+    Returns:
+        list: Job objects in run order, or None if the entry is malformed
+    """
+    entries = [entry for entry in line.split(';') if entry.strip()]
+    if len(entries) != total_jobs:
+        print(f"❌ Bulk entry has {len(entries)} jobs, expected {total_jobs}.")
+        return None
+    
+    has_flag = printer_brand == "Bambu Lab" or (printer_brand == "FlashForge" and printer_model and "AD5X" in printer_model)
+    jobs = []
+    
+    for i, fields in enumerate(csv.reader(entries, skipinitialspace=True), 1):
+        fields = [field.strip() for field in fields]
+        if len(fields) < 2 or not fields[0]:
+            print(f"❌ Bulk entry for Job {i} needs at least a filename and store slot.")
+            return None
+        
         try:
-            total_jobs = int(input("Enter number of print jobs (1-6): ").strip())
-            if 1 <= total_jobs <= 6:
-                break
-            print("❌ Please enter a number between 1 and 6.")
+            store_slot = int(fields[1])
+            grab_slot = int(fields[2]) if len(fields) > 2 and fields[2] and i < total_jobs else None
         except ValueError:
-            print("❌ Please enter a valid number.")
+            print(f"❌ Bulk entry for Job {i} has a non-numeric slot.")
+            return None
+        
+        if not 1 <= store_slot <= 6 or (grab_slot is not None and not 1 <= grab_slot <= 6):
+            print(f"❌ Bulk entry for Job {i}: slots must be between 1-6.")
+            return None
+        if i < total_jobs and grab_slot is None:
+            print(f"❌ Bulk entry for Job {i} is missing a grab slot.")
+            return None
+        
+        flag = has_flag and len(fields) > 3 and parse_yes_no(fields[3]) is True
+        jobs.append(Job(
+            filename=fields[0],
+            use_ams=flag and printer_brand == "Bambu Lab",
+            use_material_station=flag and printer_brand == "FlashForge",
+            store_slot=store_slot,
+            grab_slot=grab_slot
+        ))
+    
+    return jobs
+
+def setup_print_jobs(printer_brand=None, printer_model=None):
+    """Configure print jobs for automation sequence"""
+    banner_print("\nPRINT JOB CONFIGURATION:")
+    
+    total_jobs = prompt_int("Enter number of print jobs (1-6): ", 1, 6)
+    
+    # Optional one-line entry for all jobs
+    print("\nBulk entry: jobs separated by ';' as filename,store,grab[,y/n]")
+    bulk = input("Bulk entry (or press ENTER for step-by-step): ").strip()
+    if bulk:
+        jobs = _parse_bulk_jobs(bulk, total_jobs, printer_brand, printer_model)
+        if jobs:
+            return total_jobs, jobs
+        print("Falling back to step-by-step entry.")
     
     # Get job details
-    jobs = {}
+    jobs = []
     
     for i in range(1, total_jobs + 1):
-        print(f"\n📋 JOB {i} CONFIGURATION:")
-        print("─" * 25)
+        banner_print(f"\n📋 JOB {i} CONFIGURATION:", 25)
         
         filename = input(f"Enter filename for Job {i}: ").strip()
         
         # Ask about AMS for Bambu Lab printers
         use_ams = False
         if printer_brand == "Bambu Lab":
-            while True:
-                ams_choice = input(f"Use AMS for this print? (y/n): ").strip().lower()
-                if ams_choice in ['y', 'yes']:
-                    use_ams = True
-                    print("\nNOTE: Make sure filament was synced in Bambu Studio before slicing")
-                    break
-                elif ams_choice in ['n', 'no']:
-                    use_ams = False
-                    break
-                else:
-                    print("❌ Please enter 'y' for yes or 'n' for no.")
+            use_ams = prompt_yes_no("Use AMS for this print? (y/n): ")
+            if use_ams:
+                print("\nNOTE: Make sure filament was synced in Bambu Studio before slicing")
         
         # Ask about Material Station for FlashForge AD5X printers
         use_material_station = False
         if printer_brand == "FlashForge" and printer_model and "AD5X" in printer_model:
-            while True:
-                ms_choice = input(f"Use Material Station (AMS/CFS/IFS) for this print? (y/n): ").strip().lower()
-                if ms_choice in ['y', 'yes']:
-                    use_material_station = True
-                    print("\nNOTE: Make sure filaments are mapped correctly in your slicer as per your filament station (AMS/CFS/IFS).")
-                    break
-                elif ms_choice in ['n', 'no']:
-                    use_material_station = False
-                    break
-                else:
-                    print("❌ Please enter 'y' for yes or 'n' for no.")
+            use_material_station = prompt_yes_no("Use Material Station (AMS/CFS/IFS) for this print? (y/n): ")
+            if use_material_station:
+                print("\nNOTE: Make sure filaments are mapped correctly in your slicer as per your filament station (AMS/CFS/IFS).")
         
         # Store slot
-        while True:
-            try:
-                store_slot = int(input(f"Enter STORE slot for Job {i} (1-6): ").strip())
-                if 1 <= store_slot <= 6:
-                    break
-                print("❌ Store slot must be between 1-6.")
-            except ValueError:
-                print("❌ Please enter a valid number.")
+        store_slot = prompt_int(f"Enter STORE slot for Job {i} (1-6): ", 1, 6, "❌ Store slot must be between 1-6.")
         
         # Grab slot (not needed for last job)
         grab_slot = None
         if i < total_jobs:
-            while True:
-                try:
-                    grab_slot = int(input(f"Enter GRAB slot for Job {i} (1-6): ").strip())
-                    if 1 <= grab_slot <= 6:
-                        break
-                    print("❌ Grab slot must be between 1-6.")
-                except ValueError:
-                    print("❌ Please enter a valid number.")
+            grab_slot = prompt_int(f"Enter GRAB slot for Job {i} (1-6): ", 1, 6, "❌ Grab slot must be between 1-6.")
         
-        jobs[i] = {
-            'filename': filename,
-            'use_ams': use_ams,
-            'use_material_station': use_material_station,
-            'store_slot': store_slot,
-            'grab_slot': grab_slot
-        }
+        jobs.append(Job(filename, use_ams, use_material_station, store_slot, grab_slot))
     
     return total_jobs, jobs
 
 def get_current_rack_state():
     """Get current rack state from user"""
-    print("\nCURRENT RACK STATE SETUP:")
-    print("─" * 35)
+    banner_print("\nCURRENT RACK STATE SETUP:", 35)
     print("⚠️  Before we validate your job sequence, we need to know")
     print("   which slots currently have build plates in them.")
     print()
     
     current_rack_state = {}
-    for slot in range(6, 0, -1):  # 6 to 1 as requested
-        while True:
-            response = input(f"Does slot {slot} currently have a build plate? (y/n): ").strip().lower()
-            if response in ['y', 'yes']:
-                current_rack_state[slot] = f"existing_plate_slot_{slot}"
-                print(f"  ✅ Slot {slot}: Has build plate")
-                break
-            elif response in ['n', 'no']:
-                current_rack_state[slot] = "empty"
-                print(f"  ⬜ Slot {slot}: Empty")
-                break
-            else:
-                print("❌ Please enter 'y' for yes or 'n' for no.")
-    
-    print(f"\n📊 CURRENT RACK STATE:")
-    for slot in range(6, 0, -1):  # Display from 6 to 1
-        status = "🟢 HAS PLATE" if current_rack_state[slot] != "empty" else "⬜ EMPTY"
-        print(f"   Slot {slot}: {status}")
-    print()
+    
+    # Optional one-line entry: y/n for each slot from 6 down to 1
+    bulk = input("Bulk entry - y/n for slots 6..1, e.g. 'y y n y n n' (or press ENTER to answer each): ").strip().lower()
+    if bulk:
+        answers = [parse_yes_no(token) for token in bulk.replace(',', ' ').split()]
+        if len(answers) == 6 and None not in answers:
+            current_rack_state = {
+                slot: _EXISTING_PLATE[slot] if has_plate else _EMPTY
+                for slot, has_plate in zip(_SLOTS_DESC, answers)
+            }
+        else:
+            print("❌ Expected six y/n answers - please answer each slot instead.")
+    
+    for slot in _SLOTS_DESC:  # 6 to 1 as requested
+        if slot in current_rack_state:
+            continue
+        if prompt_yes_no(f"Does slot {slot} currently have a build plate? (y/n): "):
+            current_rack_state[slot] = _EXISTING_PLATE[slot]
+            print(f"  ✅ Slot {slot}: Has build plate")
+        else:
+            current_rack_state[slot] = _EMPTY
+            print(f"  ⬜ Slot {slot}: Empty")
+    
+    print(f"\n📊 CURRENT RACK STATE:\n{render_rack_state(current_rack_state)}\n")
     
     return current_rack_state
 
+@functools.lru_cache(maxsize=8)
+def _rack_mgr(slot_count):
+    """
+    Get the shared RackManager for a slot count
+    
+    Reuse is safe because RackManager.validate_job_sequence re-initialises its
+    rack state and simulation log at the start of every call.
+    """
+    from utils.rack_manager import RackManager
+    return RackManager(slot_count)
+
 def validate_job_sequence(jobs, current_rack_state, config_data=None):
     """Validate job sequence with current rack state"""
     # Get slot count from config or default to 6
@@ -128,34 +192,45 @@ def validate_job_sequence(jobs, current_rack_state, config_data=None):
     if config_data:
         slot_count = config_data.get('RACK_SLOT_COUNT', 6)
     
-    rack_manager = RackManager(slot_count)
+    rack_manager = _rack_mgr(slot_count)
     
     validation_result = rack_manager.validate_job_sequence(jobs, initial_rack_state=current_rack_state, slot_count=slot_count)
     if not validation_result['valid']:
-        print(f"\n❌ RACK CONFIGURATION ERROR:")
-        print(f"   {validation_result['error']}")
-        print(f"\n📊 REMINDER - Current rack state:")
-        for slot in range(6, 0, -1):  # Display from 6 to 1
-            status = "🟢 HAS PLATE" if current_rack_state[slot] != "empty" else "⬜ EMPTY"
-            print(f"   Slot {slot}: {status}")
-        print("\n💡 TIP: Make sure you're grabbing from slots that have plates")
-        print("      and storing to slots that are empty.")
-        print("\nPlease restart configuration and fix slot assignments.")
+        lines = [
+            "\n❌ RACK CONFIGURATION ERROR:",
+            f"   {validation_result['error']}",
+            "\n📊 REMINDER - Current rack state:",
+            render_rack_state(current_rack_state),
+            "\n💡 TIP: Make sure you're grabbing from slots that have plates",
+            "      and storing to slots that are empty.",
+            "\nPlease restart configuration and fix slot assignments."
+        ]
+        emit(*lines)
         return False
     
     print(f"\n✅ Rack configuration validated successfully!")
     return True
 
+# Config keys per job number: (FILENAME, USE_AMS, USE_MATERIAL_STATION, STORE_SLOT, GRAB_SLOT)
+_JOB_CONFIG_KEYS = {
+    i: (f'JOB_{i}_FILENAME', f'JOB_{i}_USE_AMS', f'JOB_{i}_USE_MATERIAL_STATION',
+        f'JOB_{i}_STORE_SLOT', f'JOB_{i}_GRAB_SLOT')
+    for i in range(1, 7)
+}
+
 def convert_jobs_to_config(jobs, total_jobs):
-    """Convert jobs dictionary to config format"""
+    """Convert the job list to config format"""
     config_data = {'TOTAL_JOBS': total_jobs}
     
-    for i, job in jobs.items():
-        config_data[f'JOB_{i}_FILENAME'] = job['filename']
-        config_data[f'JOB_{i}_USE_AMS'] = job.get('use_ams', False)
-        config_data[f'JOB_{i}_USE_MATERIAL_STATION'] = job.get('use_material_station', False)
-        config_data[f'JOB_{i}_STORE_SLOT'] = job['store_slot']
-        if job['grab_slot']:
-            config_data[f'JOB_{i}_GRAB_SLOT'] = job['grab_slot']
+    for i, job in enumerate(jobs, 1):
+        keys = _JOB_CONFIG_KEYS[i]
+        config_data.update(zip(keys, (
+            job.filename,
+            job.use_ams,
+            job.use_material_station,
+            job.store_slot
+        )))
+        if job.grab_slot:
+            config_data[keys[4]] = job.grab_slot
     
     return config_data
@@ -3,89 +3,57 @@ Printer Setup Module for OTTOMAT3D
 Handles all printer configuration wizards and setup workflows
 """
 
-from pathlib import Path
-from utils.rack_manager import RackManager
-from utils.logger import setup_logger
+import functools
+from types import MappingProxyType
+from ui.display import emit, parse_yes_no, prompt_int
+from ui.format import banner_print, header as format_header
 # from utils.macro_utils import get_default_macros  # Commented out - will handle macros separately
 
+# Default OttoEject macro names as (EJECT_MACRO, LOAD_MACRO) per specific printer model
+_MACROS = {
+    ("Bambu Lab", "P1P"): ("EJECT_FROM_BAMBULAB_P_ONE_P", "LOAD_ONTO_BAMBULAB_P_ONE_P"),
+    ("Bambu Lab", "P1S"): ("EJECT_FROM_BAMBULAB_P_ONE_S", "LOAD_ONTO_BAMBULAB_P_ONE_S"),
+    ("Bambu Lab", "X1C"): ("EJECT_FROM_BAMBULAB_X_ONE_C", "LOAD_ONTO_BAMBULAB_X_ONE_C"),
+    ("Bambu Lab", "A1"): ("EJECT_FROM_BAMBULAB_A_ONE", "LOAD_ONTO_BAMBULAB_A_ONE"),
+    ("Prusa", "MK3"): ("EJECT_FROM_PRUSA_MK_THREE", "LOAD_ONTO_PRUSA_MK_THREE"),
+    ("Prusa", "MK4"): ("EJECT_FROM_PRUSA_MK_FOUR", "LOAD_ONTO_PRUSA_MK_FOUR"),
+    ("Prusa", "Core One"): ("EJECT_FROM_PRUSA_CORE_ONE", "LOAD_ONTO_PRUSA_CORE_ONE"),
+}
+
+# Brands that use the same macros for every model
+_BRAND_DEFAULT = {
+    "FlashForge": ("EJECT_FROM_FLASHFORGE_AD_FIVE_X", "LOAD_ONTO_FLASHFORGE_AD_FIVE_X"),
+    "Creality": ("EJECT_FROM_CREALITY_K_ONE_C", "LOAD_ONTO_CREALITY_K_ONE_C"),
+    "Elegoo": ("EJECT_FROM_ELEGOO_CC", "LOAD_ONTO_ELEGOO_CC"),
+    "Anycubic": ("EJECT_FROM_ANYCUBIC_KOBRA_S_ONE", "LOAD_ONTO_ANYCUBIC_KOBRA_S_ONE"),
+}
+
+@functools.lru_cache(maxsize=64)
 def get_default_macros(printer_brand, printer_model):
-    """Get default OttoEject macro names based on printer brand and model"""
-    
-    # Hardcoded macro names for each specific printer model
-    if printer_brand == "Bambu Lab":
-        if printer_model == "P1P":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_BAMBULAB_P_ONE_P',
-                'LOAD_MACRO': 'LOAD_ONTO_BAMBULAB_P_ONE_P'
-            }
-        elif printer_model == "P1S":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_BAMBULAB_P_ONE_S',
-                'LOAD_MACRO': 'LOAD_ONTO_BAMBULAB_P_ONE_S'
-            }
-        elif printer_model == "X1C":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_BAMBULAB_X_ONE_C',
-                'LOAD_MACRO': 'LOAD_ONTO_BAMBULAB_X_ONE_C'
-            }
-        elif printer_model == "A1":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_BAMBULAB_A_ONE',
-                'LOAD_MACRO': 'LOAD_ONTO_BAMBULAB_A_ONE'
-            }
-    
-    elif printer_brand == "Prusa":
-        if printer_model == "MK3":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_PRUSA_MK_THREE',
-                'LOAD_MACRO': 'LOAD_ONTO_PRUSA_MK_THREE'
-            }
-        elif printer_model == "MK4":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_PRUSA_MK_FOUR',
-                'LOAD_MACRO': 'LOAD_ONTO_PRUSA_MK_FOUR'
-            }
-        elif printer_model == "Core One":
-            return {
-                'EJECT_MACRO': 'EJECT_FROM_PRUSA_CORE_ONE',
-                'LOAD_MACRO': 'LOAD_ONTO_PRUSA_CORE_ONE'
-            }
-    
-    elif printer_brand == "FlashForge":
-        return {
-            'EJECT_MACRO': 'EJECT_FROM_FLASHFORGE_AD_FIVE_X',
-            'LOAD_MACRO': 'LOAD_ONTO_FLASHFORGE_AD_FIVE_X'
-        }
-    
-    elif printer_brand == "Creality":
-        return {
-            'EJECT_MACRO': 'EJECT_FROM_CREALITY_K_ONE_C',
-            'LOAD_MACRO': 'LOAD_ONTO_CREALITY_K_ONE_C'
-        }
-    
-    elif printer_brand == "Elegoo":
-        return {
-            'EJECT_MACRO': 'EJECT_FROM_ELEGOO_CC',
-            'LOAD_MACRO': 'LOAD_ONTO_ELEGOO_CC'
-        }
-    
-    elif printer_brand == "Anycubic":
-        return {
-            'EJECT_MACRO': 'EJECT_FROM_ANYCUBIC_KOBRA_S_ONE',
-            'LOAD_MACRO': 'LOAD_ONTO_ANYCUBIC_KOBRA_S_ONE'
-        }
+    """
+    Get default OttoEject macro names based on printer brand and model
+    
+    Cached - the returned mapping is read-only; copy it with dict() before modifying.
+    """
+    pair = _MACROS.get((printer_brand, printer_model)) or _BRAND_DEFAULT.get(printer_brand)
+    if pair:
+        return MappingProxyType({
+            'EJECT_MACRO': pair[0],
+            'LOAD_MACRO': pair[1]
+        })
     
     # Fallback for unknown models (shouldn't happen with proper setup)
     brand_clean = printer_brand.upper().replace(' ', '_')
     model_clean = printer_model.upper().replace(' ', '_').replace('/', '_').replace('+', 'PLUS')
-    return {
+    return MappingProxyType({
         'EJECT_MACRO': f'EJECT_FROM_{brand_clean}_{model_clean}',
         'LOAD_MACRO': f'LOAD_ONTO_{brand_clean}_{model_clean}'
-    }
+    })
 
+@functools.lru_cache(maxsize=1)
 def get_supported_printers():
-    """Return dictionary of supported printer brands and models"""
-    return {
+    """Return read-only mapping of supported printer brands and models (built once)"""
+    printers = {
         "1": {
             "name": "Bambu Lab", 
             "class": "BambuLabPrinter", 
@@ -135,6 +103,59 @@ def get_supported_printers():
             "positioning": "Z200"
         }
     }
+    return MappingProxyType({key: MappingProxyType(info) for key, info in printers.items()})
+
+# Firmware warnings shown before Bambu Lab connection prompts, by model
+_BAMBU_P1_WARN = "ENSURE LAN MODE + DEVELOPER MODE IS ENABLED IF FIRMWARE VERSION >= 01.08.02.00"
+_BAMBU_A1_WARN = "ENSURE DEVELOPER MODE IS ENABLED IF FIRMWARE VERSON >= 01.05.00.00"
+_BAMBU_X1C_WARN = "ENSURE LAN MODE + DEVELOPER MODE IS ENABLED FOR X1C"
+_BAMBU_WARN = {'P1P': _BAMBU_P1_WARN, 'P1S': _BAMBU_P1_WARN, 'A1': _BAMBU_A1_WARN}
+
+def _bambu_banner(printer_model):
+    """Firmware warning shown before Bambu Lab connection prompts"""
+    return _BAMBU_WARN.get(printer_model, _BAMBU_X1C_WARN)
+
+# Connection prompts per brand: banner (text or callable taking the model),
+# (config_key, prompt) fields asked in order, and fixed defaults
+_PRINTER_PROMPTS = {
+    "Bambu Lab": {
+        'banner': _bambu_banner,
+        'fields': [
+            ('PRINTER_IP', "Enter Printer IP Address: "),
+            ('PRINTER_SERIAL', "Enter Printer Serial Number: "),
+            ('PRINTER_ACCESS_CODE', "Enter Printer Access Code: ")
+        ],
+        'defaults': {'PRINTER_MODE': "LAN_DEV_MODE"}
+    },
+    "FlashForge": {
+        'banner': "ENSURE LAN MODE IS ENABLED",
+        'fields': [
+            ('PRINTER_IP', "Enter Printer IP Address: "),
+            ('PRINTER_SERIAL', "Enter Printer Serial Number: "),
+            ('PRINTER_CHECK_CODE', "Enter Printer Check Code: ")
+        ],
+        'defaults': {'PRINTER_MODE': "LAN_MODE"}
+    },
+    "Creality": {
+        'banner': "ENSURE PRINTER IS ROOTED",
+        'fields': [('PRINTER_IP', "Enter Printer IP Address: ")]
+    },
+    "Anycubic": {
+        'banner': "ENSURE RINKHALS CUSTOM FIRMWARE IS INSTALLED",
+        'fields': [('PRINTER_IP', "Enter Printer IP Address: ")]
+    },
+    "Elegoo": {
+        'banner': None,
+        'fields': [('PRINTER_IP', "Enter Printer IP Address: ")]
+    },
+    "Prusa": {
+        'banner': "ENSURE PRUSALINK IS ENABLED",
+        'fields': [
+            ('PRINTER_IP', "Enter Printer IP Address: "),
+            ('PRINTER_API_KEY', "Enter PrusaLink API Key: ")
+        ]
+    }
+}
 
 def setup_printer_connection(selected_printer):
     """Setup printer connection details based on printer type"""
@@ -150,54 +171,28 @@ def setup_printer_connection(selected_printer):
     else:
         config_data['PRINTER_MODEL'] = selected_printer['model']
     
-    print("\nPRINTER CONFIGURATION:")
-    print("─" * 30)
+    header = [format_header("\nPRINTER CONFIGURATION:")]
     
-    if selected_printer['name'] == "Bambu Lab":
-        # No need to ask for model again - use pre-selected
-        if config_data['PRINTER_MODEL'] in ['P1P', 'P1S']:
-            print("ENSURE LAN MODE + DEVELOPER MODE IS ENABLED IF FIRMWARE VERSION >= 01.08.02.00")
-        elif config_data['PRINTER_MODEL'] in ['A1']:
-            print("ENSURE DEVELOPER MODE IS ENABLED IF FIRMWARE VERSON >= 01.05.00.00")
-        else: # X1-C
-            print("ENSURE LAN MODE + DEVELOPER MODE IS ENABLED FOR X1C")
-        
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
-        config_data['PRINTER_SERIAL'] = input("Enter Printer Serial Number: ").strip()
-        config_data['PRINTER_ACCESS_CODE'] = input("Enter Printer Access Code: ").strip()
-        config_data['PRINTER_MODE'] = "LAN_DEV_MODE"
-        
-    elif selected_printer['name'] == "FlashForge":
-        print("ENSURE LAN MODE IS ENABLED")
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
-        config_data['PRINTER_SERIAL'] = input("Enter Printer Serial Number: ").strip()
-        config_data['PRINTER_CHECK_CODE'] = input("Enter Printer Check Code: ").strip()
-        config_data['PRINTER_MODE'] = "LAN_MODE"
-        
-    elif selected_printer['name'] == "Creality":
-        print("ENSURE PRINTER IS ROOTED")
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
-        
-    elif selected_printer['name'] == "Anycubic":
-        print("ENSURE RINKHALS CUSTOM FIRMWARE IS INSTALLED")
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
+    spec = _PRINTER_PROMPTS.get(selected_printer['name'])
+    if spec:
+        banner = spec['banner']
+        if callable(banner):
+            banner = banner(config_data['PRINTER_MODEL'])
+        if banner:
+            header.append(banner)
+        emit(*header)
         
-    elif selected_printer['name'] == "Elegoo":
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
-        
-    elif selected_printer['name'] == "Prusa":
-        print("ENSURE PRUSALINK IS ENABLED")
-        
-        # No need to ask for model again - use pre-selected
-        config_data['PRINTER_IP'] = input("Enter Printer IP Address: ").strip()
-        config_data['PRINTER_API_KEY'] = input("Enter PrusaLink API Key: ").strip()
+        for config_key, prompt_text in spec['fields']:
+            config_data[config_key] = input(prompt_text).strip()
+        config_data.update(spec.get('defaults', {}))
+    else:
+        emit(*header)
     
     return config_data
     
 def change_rack_slot_count(config_data):
     """Change the number of rack slots"""
-    print("\n🔄 CHANGE OTTORACK SLOT COUNT")
-    print("─" * 35)
+    banner_print("\n🔄 CHANGE OTTORACK SLOT COUNT", 35)
     
     current_slot_count = config_data.get('RACK_SLOT_COUNT', 6)
     print(f"Current slot count: {current_slot_count}")
@@ -208,15 +203,14 @@ def change_rack_slot_count(config_data):
         print(f"\n⚠️  Warning: You have {total_jobs} configured jobs.")
         print("   Changing slot count may affect existing job configurations.")
         
-        # Find the highest slot number used in current jobs
-        highest_slot_used = 0
-        for i in range(1, total_jobs + 1):
-            store_slot = config_data.get(f'JOB_{i}_STORE_SLOT')
-            grab_slot = config_data.get(f'JOB_{i}_GRAB_SLOT')
-            if store_slot:
-                highest_slot_used = max(highest_slot_used, store_slot)
-            if grab_slot:
-                highest_slot_used = max(highest_slot_used, grab_slot)
+        # Find the highest slot number used in current jobs (config_data may
+        # still hold keys from a longer earlier job list, so only jobs 1..TOTAL_JOBS count)
+        highest_slot_used = max(
+            (config_data.get(key) or 0
+             for i in range(1, total_jobs + 1)
+             for key in (f'JOB_{i}_STORE_SLOT', f'JOB_{i}_GRAB_SLOT')),
+            default=0
+        )
         
         if highest_slot_used > 0:
             print(f"   Highest slot number used in jobs: {highest_slot_used}")
@@ -224,101 +218,114 @@ def change_rack_slot_count(config_data):
     print("\nValid slot count range: 1-6")
     
     while True:
-        try:
-            new_slot_count = input(f"Enter new slot count (current: {current_slot_count}, press ENTER to keep): ").strip()
-            
-            if not new_slot_count:
-                print("❌ No changes made.")
-                return config_data
-            
-            new_slot_count = int(new_slot_count)
-            
-            if not (1 <= new_slot_count <= 6):
-                print("❌ Slot count must be between 1-6.")
-                continue
+        new_slot_count = prompt_int(
+            f"Enter new slot count (current: {current_slot_count}, press ENTER to keep): ",
+            1, 6, "❌ Slot count must be between 1-6.", allow_blank=True
+        )
+        
+        if new_slot_count is None:
+            print("❌ No changes made.")
+            return config_data
+        
+        # Check if new slot count conflicts with existing jobs
+        if total_jobs > 0 and highest_slot_used > new_slot_count:
+            print(f"\n❌ Cannot reduce slot count to {new_slot_count}.")
+            print(f"   Your existing jobs use slot {highest_slot_used}, which is higher than {new_slot_count}.")
+            print("   Please reconfigure your jobs first or choose a higher slot count.")
+            continue
+        
+        # Confirm the change
+        if new_slot_count != current_slot_count:
+            print(f"\n✅ Changing slot count from {current_slot_count} to {new_slot_count}")
             
-            # Check if new slot count conflicts with existing jobs
-            if total_jobs > 0 and highest_slot_used > new_slot_count:
-                print(f"\n❌ Cannot reduce slot count to {new_slot_count}.")
-                print(f"   Your existing jobs use slot {highest_slot_used}, which is higher than {new_slot_count}.")
-                print("   Please reconfigure your jobs first or choose a higher slot count.")
-                continue
+            if total_jobs > 0:
+                print(f"\n📝 Note: Your {total_jobs} existing jobs will remain unchanged.")
+                print("   Make sure your physical rack has the correct number of slots.")
             
-            # Confirm the change
-            if new_slot_count != current_slot_count:
-                print(f"\n✅ Changing slot count from {current_slot_count} to {new_slot_count}")
-                
-                if total_jobs > 0:
-                    print(f"\n📝 Note: Your {total_jobs} existing jobs will remain unchanged.")
-                    print("   Make sure your physical rack has the correct number of slots.")
-                
-                confirm = input("\nConfirm this change? (y/n): ").strip().lower()
-                if confirm in ['y', 'yes']:
-                    config_data['RACK_SLOT_COUNT'] = new_slot_count
-                    print(f"✅ Slot count updated to {new_slot_count}!")
-                    return config_data
-                else:
-                    print("❌ Change cancelled.")
-                    return config_data
+            if parse_yes_no(input("\nConfirm this change? (y/n): ")):
+                config_data['RACK_SLOT_COUNT'] = new_slot_count
+                print(f"✅ Slot count updated to {new_slot_count}!")
+                return config_data
             else:
-                print("❌ No changes made.")
+                print("❌ Change cancelled.")
                 return config_data
-                
-        except ValueError:
-            print("❌ Please enter a valid number.")
+        else:
+            print("❌ No changes made.")
+            return config_data
+
+# Per-session ConfigManager and saved-profile list for the profile menu
+_CM_SINGLETON = None
+_PROFILES_CACHE = None  # (config file stamp, profiles)
+
+def _get_cm():
+    """Get the session ConfigManager (imported lazily to keep this module's import light)"""
+    global _CM_SINGLETON
+    if _CM_SINGLETON is None:
+        from config.config_manager import ConfigManager
+        _CM_SINGLETON = ConfigManager()
+    return _CM_SINGLETON
+
+def invalidate_profile_cache():
+    """Drop the cached profile list so the next menu visit re-reads config.txt"""
+    global _PROFILES_CACHE
+    _PROFILES_CACHE = None
+
+def _get_profiles():
+    """Get saved profiles, re-reading config.txt only if it changed since the last read"""
+    global _PROFILES_CACHE
+    config_manager = _get_cm()
+    try:
+        stat = config_manager.config_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None
+    
+    if stamp is None or _PROFILES_CACHE is None or _PROFILES_CACHE[0] != stamp:
+        _PROFILES_CACHE = (stamp, config_manager.get_available_profiles())
+    return _PROFILES_CACHE[1]
 
 def select_saved_printer_profile():
     """Let user select from saved printer profiles"""
-    from config.config_manager import ConfigManager
-    
-    config_manager = ConfigManager()
-    profiles = config_manager.get_available_profiles()
+    config_manager = _get_cm()
+    profiles = _get_profiles()
     
     if not profiles:
         print("\n⚠️  No saved printer profiles found.")
         print("   Use Option 4 to setup and save a new printer profile.")
         return None
     
-    print("\n📋 SAVED PRINTER PROFILES:")
-    print("─" * 50)
-    
+    lines = [format_header("\n📋 SAVED PRINTER PROFILES:", 50)]
     for i, profile in enumerate(profiles, 1):
-        print(f"{i}. {profile['name']}")
-        print(f"   {profile['brand']} {profile['model']} - {profile['ip']}")
-        print()
+        lines.append(f"{i}. {profile['name']}")
+        lines.append(f"   {profile['brand']} {profile['model']} - {profile['ip']}")
+        lines.append("")
+    emit(*lines)
+    
+    choice = prompt_int(f"Select profile (1-{len(profiles)}): ", 1, len(profiles),
+                        f"❌ Please enter a number between 1-{len(profiles)}.")
+    selected_profile = profiles[choice - 1]
+    
+    # Load the complete printer configuration
+    printer_config = config_manager.load_printer_profile(selected_profile['id'])
+    if not printer_config:
+        print("❌ Failed to load profile configuration")
+        return None
     
-    while True:
-        try:
-            choice = int(input(f"Select profile (1-{len(profiles)}): ").strip())
-            if 1 <= choice <= len(profiles):
-                selected_profile = profiles[choice - 1]
-                
-                # Load the complete printer configuration
-                printer_config = config_manager.load_printer_profile(selected_profile['id'])
-                if not printer_config:
-                    print("❌ Failed to load profile configuration")
-                    return None
-                
-                # Set as active profile
-                config_manager.set_active_profile(selected_profile['id'])
-                
-                print(f"\n✅ Selected: {selected_profile['name']}")
-                print(f"📋 {selected_profile['brand']} {selected_profile['model']} at {selected_profile['ip']}")
-                
-                return printer_config
-            else:
-                print(f"❌ Please enter a number between 1-{len(profiles)}.")
-        except ValueError:
-            print("❌ Please enter a valid number.")
+    # Set as active profile
+    config_manager.set_active_profile(selected_profile['id'])
+    invalidate_profile_cache()
+    
+    print(f"\n✅ Selected: {selected_profile['name']}")
+    print(f"📋 {selected_profile['brand']} {selected_profile['model']} at {selected_profile['ip']}")
+    
+    return printer_config
 
 def setup_ottoeject_config():
     """Setup OttoEject configuration"""
-    print("OTTOEJECT CONFIGURATION:")
-    print("─" * 30)
+    banner_print("OTTOEJECT CONFIGURATION:")
     ottoeject_ip = input("Enter OttoEject IP/Hostname (e.g., ottoeject.local): ").strip()
     
-    print("\nOTTOEJECT MACRO CONFIGURATION:")
-    print("─" * 40)
+    banner_print("\nOTTOEJECT MACRO CONFIGURATION:", 40)
     eject_macro = input("Enter EJECT macro name (e.g., EJECT_FROM_P1): ").strip()
     load_macro = input("Enter LOAD macro name (e.g., LOAD_ONTO_P1): ").strip()
     
@@ -330,8 +337,7 @@ def setup_ottoeject_config():
 
 def setup_ottoeject_macros_only():
     """Setup only OttoEject macro names (keep existing IP)"""
-    print("OTTOEJECT MACRO CONFIGURATION:")
-    print("─" * 40)
+    banner_print("OTTOEJECT MACRO CONFIGURATION:", 40)
     print("(Keeping existing OttoEject IP)")
     print()
     eject_macro = input("Enter EJECT macro name (e.g., EJECT_FROM_P1): ").strip()
@@ -342,76 +348,49 @@ def setup_ottoeject_macros_only():
         'LOAD_MACRO': load_macro
     }
 
+# Editable fields in modify_printer_details: (config_key, label) shared by
+# every brand, then the brand-specific connection details
+_MODIFY_COMMON = (
+    ('PRINTER_IP', "Printer IP"),
+    ('EJECT_MACRO', "Eject Macro"),
+    ('LOAD_MACRO', "Load Macro")
+)
+_MODIFY_FIELDS = {
+    "Bambu Lab": (('PRINTER_SERIAL', "Serial Number"), ('PRINTER_ACCESS_CODE', "Access Code")),
+    "FlashForge": (('PRINTER_SERIAL', "Serial Number"), ('PRINTER_CHECK_CODE', "Check Code")),
+    "Prusa": (('PRINTER_API_KEY', "API Key"),)
+}
+
 def modify_printer_details(config_data):
     """Modify existing printer details"""
-    print("\n🔧 MODIFY PRINTER DETAILS")
-    print("─" * 30)
-    
-    print("Current Printer Details:")
-    print(f"  Brand: {config_data.get('PRINTER_BRAND')}")
-    print(f"  Model: {config_data.get('PRINTER_MODEL')}")
-    print(f"  IP: {config_data.get('PRINTER_IP')}")
-    print(f"  Eject Macro: {config_data.get('EJECT_MACRO')}")
-    print(f"  Load Macro: {config_data.get('LOAD_MACRO')}")
-    
-    # Show printer-specific details
     printer_brand = config_data.get('PRINTER_BRAND')
-    if printer_brand == "Bambu Lab":
-        print(f"  Serial Number: {config_data.get('PRINTER_SERIAL', 'Not set')}")
-        print(f"  Access Code: {config_data.get('PRINTER_ACCESS_CODE', 'Not set')}")
-    elif printer_brand == "FlashForge":
-        print(f"  Serial Number: {config_data.get('PRINTER_SERIAL', 'Not set')}")
-        print(f"  Check Code: {config_data.get('PRINTER_CHECK_CODE', 'Not set')}")
-    elif printer_brand == "Prusa":
-        print(f"  API Key: {config_data.get('PRINTER_API_KEY', 'Not set')}")
-    
-    print()
-    
-    # Modify IP
-    new_ip = input(f"New Printer IP (current: {config_data.get('PRINTER_IP')}, press ENTER to keep): ").strip()
-    if new_ip:
-        config_data['PRINTER_IP'] = new_ip
-    
-    # Modify macros
-    new_eject = input(f"New Eject Macro (current: {config_data.get('EJECT_MACRO')}, press ENTER to keep): ").strip()
-    if new_eject:
-        config_data['EJECT_MACRO'] = new_eject
-    
-    new_load = input(f"New Load Macro (current: {config_data.get('LOAD_MACRO')}, press ENTER to keep): ").strip()
-    if new_load:
-        config_data['LOAD_MACRO'] = new_load
-    
-    # Modify printer-specific details
-    if printer_brand == "Bambu Lab":
-        new_serial = input(f"New Serial Number (current: {config_data.get('PRINTER_SERIAL')}, press ENTER to keep): ").strip()
-        if new_serial:
-            config_data['PRINTER_SERIAL'] = new_serial
-        
-        new_access = input(f"New Access Code (current: {config_data.get('PRINTER_ACCESS_CODE')}, press ENTER to keep): ").strip()
-        if new_access:
-            config_data['PRINTER_ACCESS_CODE'] = new_access
-    
-    elif printer_brand == "FlashForge":
-        new_serial = input(f"New Serial Number (current: {config_data.get('PRINTER_SERIAL')}, press ENTER to keep): ").strip()
-        if new_serial:
-            config_data['PRINTER_SERIAL'] = new_serial
-        
-        new_check = input(f"New Check Code (current: {config_data.get('PRINTER_CHECK_CODE')}, press ENTER to keep): ").strip()
-        if new_check:
-            config_data['PRINTER_CHECK_CODE'] = new_check
+    brand_fields = _MODIFY_FIELDS.get(printer_brand, ())
+    
+    lines = [
+        format_header("\n🔧 MODIFY PRINTER DETAILS"),
+        "Current Printer Details:",
+        f"  Brand: {printer_brand}",
+        f"  Model: {config_data.get('PRINTER_MODEL')}",
+        f"  IP: {config_data.get('PRINTER_IP')}",
+        f"  Eject Macro: {config_data.get('EJECT_MACRO')}",
+        f"  Load Macro: {config_data.get('LOAD_MACRO')}"
+    ]
+    # Show printer-specific details
+    lines.extend(f"  {label}: {config_data.get(key, 'Not set')}" for key, label in brand_fields)
+    lines.append("")
+    emit(*lines)
     
-    elif printer_brand == "Prusa":
-        new_api_key = input(f"New API Key (current: {config_data.get('PRINTER_API_KEY')}, press ENTER to keep): ").strip()
-        if new_api_key:
-            config_data['PRINTER_API_KEY'] = new_api_key
+    for key, label in _MODIFY_COMMON + brand_fields:
+        new_value = input(f"New {label} (current: {config_data.get(key)}, press ENTER to keep): ").strip()
+        if new_value:
+            config_data[key] = new_value
     
     print("✅ Printer details updated!")
     return config_data
 
 def change_ottoeject_ip(config_data):
     """Change OttoEject IP address"""
-    print("\n🔧 CHANGE OTTOEJECT IP")
-    print("─" * 25)
+    banner_print("\n🔧 CHANGE OTTOEJECT IP", 25)
     
     current_ip = config_data.get('OTTOEJECT_IP', 'Not set')
     print(f"Current OttoEject IP: {current_ip}")
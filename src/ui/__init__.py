@@ -5,18 +5,32 @@ Handles all user interface elements, ASCII art, and menu displays
 
 from .display import (
     display_welcome,
+    display_welcome_with_scroll_message,
     display_main_menu,
     get_menu_choice,
     get_printer_choice,
+    emit,
+    prompt_int,
+    parse_yes_no,
+    prompt_yes_no,
     display_automation_header,
     display_automation_footer
 )
+from .format import DIV, header, banner_print
 
 __all__ = [
     'display_welcome',
+    'display_welcome_with_scroll_message',
     'display_main_menu', 
     'get_menu_choice',
     'get_printer_choice',
+    'emit',
+    'prompt_int',
+    'parse_yes_no',
+    'prompt_yes_no',
     'display_automation_header',
-    'display_automation_footer'
+    'display_automation_footer',
+    'DIV',
+    'header',
+    'banner_print'
 ]
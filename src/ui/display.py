@@ -3,7 +3,24 @@ UI Display Module for OTTOMAT3D
 Handles all user interface elements, ASCII art, and menu displays
 """
 
+import functools
 import os
+import sys
+import time
+from io import StringIO
+from .format import DIV
+
+# ANSI clear screen + cursor home, written instead of spawning cls/clear
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+if os.name == 'nt':
+    os.system('')  # One-time switch of the Windows console into VT (ANSI) mode
+
+# Session log timestamp format (matches the log file names)
+_LOG_FMT = "%Y%m%d_%H%M%S"
+
+# Heavy separators for banners (dashed dividers come from ui.format.DIV)
+_SEP_EQ_80 = "═" * 80
+_SEP_EQ_88 = "═" * 88
 
 # ASCII Art Logo
 OTTOMAT3D_LOGO = """
@@ -25,137 +42,318 @@ COPYRIGHT_NOTICE = """                     © 2025 OTTOMAT3D Team. All Rights Re
              Proprietary Software - Unauthorized Distribution Prohibited
                           For Authorized Beta Testers Only"""
 
+# Welcome screen below the logo, rendered once (ends with the trailing blank line)
+_WELCOME_TEXT = "\n".join((
+    _SEP_EQ_88,
+    f"                    OTTOMAT3D MASTER AUTOMATION SCRIPT v{VERSION}",
+    "                           Multi-Printer Automation Suite",
+    _SEP_EQ_88,
+    COPYRIGHT_NOTICE,
+    _SEP_EQ_88,
+    ""
+))
+
+# Static part of the main menu, rendered once (ends with the trailing blank line)
+_MAIN_MENU_STATIC = "\n".join((
+    "OTTOMAT3D AUTOMATION OPTIONS:",
+    DIV[50],
+    "1. Setup a New Printer",
+    "2. Select a Different Printer",
+    "3. Start New Print Jobs",
+    "4. Start Last Print Jobs (Same Printer + Same Print Jobs)",
+    "5. Modify Existing Printer Details (IP, Serial Number, Etc...)",
+    "6. Change OttoEject IP Address",
+    "7. Test OttoEject Connection",
+    "8. Test Printer Connection",
+    "9. Move Print Bed for Calibration",
+    "",
+    ""
+))
+
+def _flush():
+    """Flush stdout so a prompt is visible before blocking on input()"""
+    sys.stdout.flush()
+
+@functools.lru_cache(maxsize=16)
+def _encoded(text):
+    """UTF-8 bytes of a constant screen block, with the platform line endings"""
+    return text.replace("\n", os.linesep).encode("utf-8")
+
+def _write_static(text):
+    """
+    Write a constant screen block, skipping the text encoder when possible
+    
+    When stdout is a UTF-8 text stream the cached pre-encoded bytes go straight
+    to its binary buffer, so large box-drawing/emoji blocks are not re-encoded
+    on every call (notably slow on Windows consoles). Other streams get the text.
+    """
+    stream = sys.stdout
+    buffer = getattr(stream, 'buffer', None)
+    if buffer is not None and (getattr(stream, 'encoding', None) or '').lower().replace('-', '') == 'utf8':
+        stream.flush()
+        buffer.write(_encoded(text))
+        buffer.flush()
+    else:
+        stream.write(text)
+        stream.flush()
+
+# Current configuration block under the main menu: brand, model, printer IP,
+# OttoEject IP, total jobs
+_CONFIG_TMPL = (
+    "CURRENT CONFIGURATION:\n" + DIV[30] + "\n"
+    "Printer: %s %s\n"
+    "Printer IP: %s\n"
+    "OttoEject IP: %s\n"
+    "Total Jobs: %s\n\n"
+)
+
+# Footer session summary around the files printed line: queue status, printer,
+# OttoEject IP, then last printed file, store location
+_SESSION_SUMMARY_HEAD = (
+    "📊 SESSION SUMMARY:\n" + DIV[40] + "\n"
+    "%s\n"
+    "Printer: %s\n"
+    "Ottoeject IP: %s\n"
+    "Files printed: "
+)
+_SESSION_SUMMARY_TAIL = (
+    "Last printed file: %s\n"
+    "Store location: %s\n"
+)
+
+# Full welcome screens, with and without the scroll-up hint
+_WELCOME_SCREEN = f"{_CLEAR_SCREEN}{OTTOMAT3D_LOGO}\n{_WELCOME_TEXT}\n"
+_WELCOME_SCREEN_SCROLL = (
+    f"{_CLEAR_SCREEN}{OTTOMAT3D_LOGO}\n{_WELCOME_TEXT}"
+    "                     (scroll up to see previous commands)\n\n"
+)
+
 def display_welcome(show_scroll_message=False):
     """Display welcome screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print(OTTOMAT3D_LOGO)
-    print(f"════════════════════════════════════════════════════════════════════════════════════════")
-    print(f"                    OTTOMAT3D MASTER AUTOMATION SCRIPT v{VERSION}")
-    print(f"                           Multi-Printer Automation Suite")
-    print(f"════════════════════════════════════════════════════════════════════════════════════════")
-    print(COPYRIGHT_NOTICE)
-    print(f"════════════════════════════════════════════════════════════════════════════════════════")
-    
     if show_scroll_message:
-        print("                     (scroll up to see previous commands)")
-    
-    print()
+        display_welcome_with_scroll_message()
+        return
+    _write_static(_WELCOME_SCREEN)
+
+def display_welcome_with_scroll_message():
+    """Display welcome screen with a hint to scroll up to earlier output"""
+    _write_static(_WELCOME_SCREEN_SCROLL)
 
 def display_main_menu(existing_config):
     """Display the main menu with all options"""
-    print("OTTOMAT3D AUTOMATION OPTIONS:")
-    print("─" * 50)
-    print("1. Setup a New Printer")
-    print("2. Select a Different Printer")
-    print("3. Start New Print Jobs")
-    print("4. Start Last Print Jobs (Same Printer + Same Print Jobs)")
-    print("5. Modify Existing Printer Details (IP, Serial Number, Etc...)")
-    print("6. Change OttoEject IP Address")
-    print("7. Test OttoEject Connection")
-    print("8. Test Printer Connection")
-    print("9. Move Print Bed for Calibration")
-    print()
-    
+    out = _MAIN_MENU_STATIC
     if existing_config:
-        print("CURRENT CONFIGURATION:")
-        print("─" * 30)
-        print(f"Printer: {existing_config.get('PRINTER_BRAND')} {existing_config.get('PRINTER_MODEL', '')}")
-        print(f"Printer IP: {existing_config.get('PRINTER_IP')}")
-        print(f"OttoEject IP: {existing_config.get('OTTOEJECT_IP')}")
-        print(f"Total Jobs: {existing_config.get('TOTAL_JOBS', 0)}")
-        print()
+        get = existing_config.get
+        out += _CONFIG_TMPL % (
+            get('PRINTER_BRAND'), get('PRINTER_MODEL', ''), get('PRINTER_IP'),
+            get('OTTOEJECT_IP'), get('TOTAL_JOBS', 0)
+        )
+    sys.stdout.write(out)
+    sys.stdout.flush()
+
+# Valid main menu selections, plus the menu and printer-brand prompts and errors
+_VALID_MENU_CHOICES = frozenset("123456789")
+_PROMPT_MENU = "Select option (1-9): "
+_PROMPT_PRINTER = "SELECT PRINTER BRAND (1-6): "
+_INVALID_MENU = "❌ Invalid selection. Please choose 1-9.\n"
+_INVALID_PRINTER = "❌ Invalid selection. Please choose 1-6.\n"
 
 def get_menu_choice(has_existing_config):
     """Get and validate menu choice from user"""
+    _flush()
     while True:
-        choice = input("Select option (1-9): ").strip()
-        if choice in ['1', '2', '3', '4', '5', '6', '7', '8', '9']:
+        choice = input(_PROMPT_MENU)
+        # Plain single-digit answers need no strip()
+        if len(choice) == 1 and choice in _VALID_MENU_CHOICES:
             return choice
-        print("❌ Invalid selection. Please choose 1-9.")
+        choice = choice.strip()
+        if choice in _VALID_MENU_CHOICES:
+            return choice
+        sys.stdout.write(_INVALID_MENU)
 
-def display_supported_printers():
-    """Display supported printer brands for selection"""
-    # THIS DICTIONARY IS NOW CORRECTED AND COMPLETE
-    printers = {
-        "1": {
-            "name": "Bambu Lab", 
-            "class": "BambuLabPrinter", 
-            "requirements": "LAN MODE + DEVELOPER MODE ENABLED",
-            "model": "P1P/P1S/X1C (Z-bed) or A1 (Sling bed)",
-            "type": "auto_detect",
-            "positioning": "Z200 or Y170"
-        },
-        "2": {
-            "name": "Prusa", 
-            "class": "PrusaPrinter", 
-            "requirements": "PRUSALINK ENABLED",
-            "model": "MK3/MK4/Core One",
-            "type": "auto_detect", 
-            "positioning": "Y210/Z200"
-        },
-        "3": {
-            "name": "FlashForge", 
-            "class": "FlashForgePrinter", 
-            "requirements": "LAN MODE ENABLED",
-            "model": "AD5X/5M Pro",
-            "type": "z_bed", 
-            "positioning": "Z170"
-        },
-        "4": {
-            "name": "Creality", 
-            "class": "CrealityPrinter", 
-            "requirements": "PRINTER MUST BE ROOTED",
-            "model": "K1/K1C",
-            "type": "z_bed", 
-            "positioning": "Z200"
-        },
-        "5": {
-            "name": "Elegoo", 
-            "class": "ElegooPrinter", 
-            "requirements": "",
-            "model": "Centauri Carbon",
-            "type": "z_bed", 
-            "positioning": "ENSURE G1 Z150 at the end of your gcode file"
-        },
-        "6": {
-            "name": "Anycubic", 
-            "class": "AnycubicPrinter", 
-            "requirements": "RINKHALS CUSTOM FIRMWARE REQUIRED",
-            "model": "Kobra S1",
-            "type": "z_bed", 
-            "positioning": "Z200"
-        }
+def emit(*lines):
+    """Write several lines to stdout with a single write call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def prompt_int(prompt, low, high, range_error=None, allow_blank=False):
+    """
+    Prompt until the user enters a whole number between low and high (inclusive)
+    
+    Args:
+        prompt: Input prompt text
+        low: Lowest accepted value
+        high: Highest accepted value
+        range_error: Message for out-of-range numbers (default: generic range message)
+        allow_blank: Return None on empty input instead of re-prompting
+    
+    Returns:
+        int: The entered number (None for blank input when allow_blank is set)
+    """
+    while True:
+        raw = input(prompt).strip()
+        if allow_blank and not raw:
+            return None
+        try:
+            value = int(raw)
+        except ValueError:
+            print("❌ Please enter a valid number.")
+            continue
+        if low <= value <= high:
+            return value
+        print(range_error or f"❌ Please enter a number between {low} and {high}.")
+
+# Accepted yes/no answers, looked up once instead of chained membership tests
+_YN = {'y': True, 'yes': True, 'n': False, 'no': False}
+
+def parse_yes_no(answer):
+    """
+    Interpret a yes/no answer
+    
+    Args:
+        answer: Raw user input
+    
+    Returns:
+        bool or None: True for y/yes, False for n/no, None if unrecognised
+    """
+    return _YN.get(answer.strip().lower())
+
+# Footer "was the print successful?" answers mapped straight to their reply
+_YN_DISPATCH = {
+    answer: "✅ Print job marked as successful!\n" if ok else "❌ Print job marked as failed.\n"
+    for answer, ok in _YN.items()
+}
+
+def prompt_yes_no(prompt):
+    """
+    Prompt until the user answers yes or no
+    
+    Returns:
+        bool: True for y/yes, False for n/no
+    """
+    while True:
+        answer = parse_yes_no(input(prompt))
+        if answer is not None:
+            return answer
+        print("❌ Please enter 'y' for yes or 'n' for no.")
+
+# Supported printer brands keyed by menu number
+_SUPPORTED_PRINTERS = {
+    "1": {
+        "name": "Bambu Lab", 
+        "class": "BambuLabPrinter", 
+        "requirements": "LAN MODE + DEVELOPER MODE ENABLED",
+        "model": "P1P/P1S/X1C (Z-bed) or A1 (Sling bed)",
+        "type": "auto_detect",
+        "positioning": "Z200 or Y170"
+    },
+    "2": {
+        "name": "Prusa", 
+        "class": "PrusaPrinter", 
+        "requirements": "PRUSALINK ENABLED",
+        "model": "MK3/MK4/Core One",
+        "type": "auto_detect", 
+        "positioning": "Y210/Z200"
+    },
+    "3": {
+        "name": "FlashForge", 
+        "class": "FlashForgePrinter", 
+        "requirements": "LAN MODE ENABLED",
+        "model": "AD5X/5M Pro",
+        "type": "z_bed", 
+        "positioning": "Z170"
+    },
+    "4": {
+        "name": "Creality", 
+        "class": "CrealityPrinter", 
+        "requirements": "PRINTER MUST BE ROOTED",
+        "model": "K1/K1C",
+        "type": "z_bed", 
+        "positioning": "Z200"
+    },
+    "5": {
+        "name": "Elegoo", 
+        "class": "ElegooPrinter", 
+        "requirements": "",
+        "model": "Centauri Carbon",
+        "type": "z_bed", 
+        "positioning": "ENSURE G1 Z150 at the end of your gcode file"
+    },
+    "6": {
+        "name": "Anycubic", 
+        "class": "AnycubicPrinter", 
+        "requirements": "RINKHALS CUSTOM FIRMWARE REQUIRED",
+        "model": "Kobra S1",
+        "type": "z_bed", 
+        "positioning": "Z200"
     }
+}
+
+@functools.lru_cache(maxsize=8)
+def _render_printer_menu(printer_type=None):
+    """
+    Render the supported printer brand list
     
-    print("SUPPORTED PRINTER BRANDS:")
-    print("─" * 50)
-    for key, printer in printers.items():
-        print(f"{key}. {printer['name']}")
-    print()
+    Args:
+        printer_type: Only list brands of this 'type' (None lists every brand)
     
-    return printers
+    Returns:
+        str: Menu text, cached per printer_type
+    """
+    return "".join((
+        f"SUPPORTED PRINTER BRANDS:\n{DIV[50]}\n",
+        "".join(
+            f"{key}. {printer['name']}\n" for key, printer in _SUPPORTED_PRINTERS.items()
+            if printer_type is None or printer['type'] == printer_type
+        ),
+        "\n"
+    ))
+
+def display_supported_printers():
+    """Display supported printer brands for selection"""
+    _write_static(_render_printer_menu())
+    return _SUPPORTED_PRINTERS
 
 def get_printer_choice():
     """Get printer selection from user"""
     printers = display_supported_printers()
     
     while True:
-        choice = input("SELECT PRINTER BRAND (1-6): ").strip()
-        if choice in printers:
-            return printers[choice]
-        print("❌ Invalid selection. Please choose 1-6.")
+        choice = input(_PROMPT_PRINTER)
+        if choice in printers or (choice := choice.strip()) in printers:
+            # Copy so per-selection details (model, bed type) don't leak into the table
+            return dict(printers[choice])
+        sys.stdout.write(_INVALID_PRINTER)
+
+# Automation banner templates, filled by _render() on top of _BASE
+_BASE = {"bar": _SEP_EQ_80}
+_TEMPLATES = {
+    "header": "\n%(bar)s\n%(title)s\n%(bar)s\n",
+    "footer": (
+        "\nAutomation %(outcome)s. %(completed)s/%(total)s jobs successful.\n"
+        "\n%(bar)s\n🏁 AUTOMATION %(status)s\n%(bar)s\n"
+    )
+}
+
+@functools.lru_cache(maxsize=32)
+def _render_to_str(name, items):
+    """Fill template 'name' with _BASE plus the (key, value) pairs in items"""
+    return _TEMPLATES[name] % {**_BASE, **dict(items)}
+
+def _render_str(name, **kw):
+    """Fill template 'name' with keyword values (cached per distinct values)"""
+    return _render_to_str(name, tuple(sorted(kw.items())))
+
+def _render(name, **kw):
+    """Write a filled template to stdout and flush it"""
+    sys.stdout.write(_render_str(name, **kw))
+    sys.stdout.flush()
 
 def display_automation_header():
     """Display automation sequence header"""
-    print("\n" + "═" * 80)
-    print("🚀 STARTING AUTOMATION SEQUENCE")
-    print("═" * 80)
+    _write_static(_render_str("header", title="🚀 STARTING AUTOMATION SEQUENCE"))
 
 def display_automation_footer_enhanced(completed_jobs, total_jobs, config_data, was_interrupted=False):
     """Enhanced automation footer with detailed completion summary"""
-    import time
-    from datetime import datetime
-    
     # Status determination
     if was_interrupted:
         status = "STOPPED"
@@ -174,56 +372,49 @@ def display_automation_footer_enhanced(completed_jobs, total_jobs, config_data,
     ottoeject_ip = config_data.get('OTTOEJECT_IP', 'Unknown')
     
     # Get files printed
-    files_printed = []
+    files_printed = [config_data.get(f'JOB_{n}_FILENAME', f'Job_{n}') for n in range(1, completed_jobs + 1)]
     printed_file = "None"
     store_location = "N/A"
     
-    if completed_jobs > 0:
-        for job_num in range(1, completed_jobs + 1):
-            filename = config_data.get(f'JOB_{job_num}_FILENAME', f'Job_{job_num}')
-            files_printed.append(filename)
-            # Last completed file details
-            if job_num == completed_jobs:
-                printed_file = filename
-                store_location = f"Slot {config_data.get(f'JOB_{job_num}_STORE_SLOT', 'Unknown')}"
-    
-    files_list = ", ".join(files_printed) if files_printed else "None"
+    # Last completed file details
+    if files_printed:
+        printed_file = files_printed[-1]
+        store_location = f"Slot {config_data.get(f'JOB_{completed_jobs}_STORE_SLOT', 'Unknown')}"
     
     # Create log filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime(_LOG_FMT)
     log_filename = f"ottomat3d_session_{timestamp}.log"
     
-    print(f"\nAutomation {status.lower()}. {completed_jobs}/{total_jobs} jobs successful.")
-    print("\n" + "═" * 80)
-    print(f"🏁 AUTOMATION {status}")
-    print("═" * 80)
-    print()
-    print("📊 SESSION SUMMARY:")
-    print("─" * 40)
-    print(f"{queue_status}")
-    print(f"Printer: {printer_name}")
-    print(f"Ottoeject IP: {ottoeject_ip}")
-    print(f"Files printed: {files_list}")
-    print(f"Last printed file: {printed_file}")
-    print(f"Store location: {store_location}")
-    print()
+    # Emit everything up to the first prompt as one write
+    buf = StringIO()
+    w = buf.write
+    w(_render_str("footer", outcome=status.lower(), completed=completed_jobs, total=total_jobs, status=status))
+    w("\n")
+    w(_SESSION_SUMMARY_HEAD % (queue_status, printer_name, ottoeject_ip))
+    if files_printed:
+        files = iter(files_printed)
+        w(next(files))
+        for filename in files:
+            w(", ")
+            w(filename)
+    else:
+        w("None")
+    w("\n")
+    w(_SESSION_SUMMARY_TAIL % (printed_file, store_location))
+    w("\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
     
     # Only ask for success confirmation if jobs were completed
     if completed_jobs > 0 and status == "COMPLETED":
         while True:
-            success_input = input("Was the print job successful? (y/n): ").strip().lower()
-            if success_input in ['y', 'yes']:
-                print("✅ Print job marked as successful!")
-                break
-            elif success_input in ['n', 'no']:
-                print("❌ Print job marked as failed.")
+            reply = _YN_DISPATCH.get(input("Was the print job successful? (y/n): ").strip().lower())
+            if reply is not None:
+                sys.stdout.write(reply)
                 break
-            else:
-                print("Please enter 'Yes' or 'No'")
+            sys.stdout.write("Please enter 'Yes' or 'No'\n")
     
-    print()
-    print(f"Thank you. Log saved: {log_filename}")
-    print()
+    sys.stdout.write(f"\nThank you. Log saved: {log_filename}\n\n")
     
     try:
         input("Press any key to exit...")
@@ -234,10 +425,7 @@ def display_automation_footer_enhanced(completed_jobs, total_jobs, config_data,
 
 def display_automation_footer(completed_jobs, total_jobs):
     """Original simple automation footer (kept for compatibility)"""
-    print(f"\nAutomation completed. {completed_jobs}/{total_jobs} jobs successful.")
-    print("\n" + "═" * 80)
-    print("🏁 AUTOMATION FINISHED")
-    print("═" * 80)
+    _render("footer", outcome="completed", completed=completed_jobs, total=total_jobs, status="FINISHED")
     
     try:
         input("Press ENTER to exit...")
@@ -0,0 +1,26 @@
+"""
+Formatting Helpers for OTTOMAT3D
+Shared section dividers and headers for console output
+"""
+
+import sys
+
+# Section dividers by width, built once at import
+DIV = {width: "─" * width for width in (25, 30, 35, 40, 45, 50)}
+
+def header(title, width=30):
+    """
+    Build a section header: the title line followed by a divider
+
+    Args:
+        title: Header text (include a leading newline for a blank line above)
+        width: Divider width, one of the widths in DIV
+
+    Returns:
+        str: Title and divider joined by a newline
+    """
+    return f"{title}\n{DIV[width]}"
+
+def banner_print(title, width=30):
+    """Write a section header to stdout with a single write call"""
+    sys.stdout.write(header(title, width) + "\n")
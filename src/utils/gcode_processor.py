@@ -4,24 +4,271 @@ Handles downloading, modifying, and uploading G-code files for specific printer
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
 import os
+import io
+import shutil
 from pathlib import Path
 from urllib.parse import quote
 from utils.logger import setup_logger
+from ui.display import emit
+from ui.format import DIV
 import time
 import hashlib
 import uuid
 import re
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Compiled "G1 Z<position>" patterns keyed by Z position (e.g. "200", "205")
+_Z_PATTERN_CACHE = {}
+
+def _get_z_pattern(z_position):
+    """
+    Get the compiled pattern for ANY Z positioning command at z_position
+    
+    Matches patterns like: G1 Z200, G1 Z200 F600, G1Z200F1500, g1 z200 f300, etc.
+    regardless of case or F speed.
+    """
+    pattern = _Z_PATTERN_CACHE.get(z_position)
+    if pattern is None:
+        pattern = _Z_PATTERN_CACHE[z_position] = re.compile(
+            rf'g1\s*z\s*{z_position}(?:\s*f\d+)?', re.IGNORECASE
+        )
+    return pattern
+
+# Compiled raw-text "G1 Z<position>" patterns keyed by Z position
+_Z_LINE_PATTERN_CACHE = {}
+
+# Whitespace or ';' that does not end a line (str.splitlines() line breaks excluded)
+_INLINE_SEP = r'(?:[^\S\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]|;)*'
+
+def _get_z_line_pattern(z_position):
+    """
+    Get the pattern that finds a Z positioning command in uncleaned G-code text
+    
+    Equivalent to stripping spaces and semicolons from each line and searching
+    it with _get_z_pattern(), but the separators are matched in place and never
+    across a line break, so a block of joined lines can be scanned in one search.
+    """
+    pattern = _Z_LINE_PATTERN_CACHE.get(z_position)
+    if pattern is None:
+        digits = '[ ;]*'.join(re.escape(digit) for digit in z_position)
+        pattern = _Z_LINE_PATTERN_CACHE[z_position] = re.compile(
+            rf'g[ ;]*1{_INLINE_SEP}z{_INLINE_SEP}{digits}', re.IGNORECASE
+        )
+    return pattern
+
+# Compiled bytes probes for Z positioning commands keyed by Z position
+_Z_PROBE_CACHE = {}
+
+def _get_z_probe(z_position):
+    """
+    Get the bytes pattern used to probe raw file bytes for a Z positioning command
+    
+    Accepts everything _get_z_line_pattern() matches once decoded (any byte
+    that could decode to whitespace is allowed as a separator), so a miss
+    means the window can be skipped without decoding it.
+    """
+    probe = _Z_PROBE_CACHE.get(z_position)
+    if probe is None:
+        sep = rb'[\s;\x1c-\x1f\x80-\xff]*'
+        digits = b'[ ;]*'.join(re.escape(digit.encode('ascii')) for digit in z_position)
+        probe = _Z_PROBE_CACHE[z_position] = re.compile(
+            rb'g[ ;]*1' + sep + rb'z' + sep + digits, re.IGNORECASE
+        )
+    return probe
+
+# Section markers located directly in the file bytes. Each is found with a
+# single bytes find/rfind, which runs at memchr speed; one combined marker regex
+# over the whole mapping would have to step through every byte and is over 100x slower.
+_EXECUTABLE_BLOCK_END = b"; EXECUTABLE_BLOCK_END"
+_MACHINE_END_GCODE = b"; machine_end_gcode"
+
+def _line_start(buf, pos):
+    """Offset of the start of the line containing pos"""
+    return buf.rfind(b"\n", 0, pos) + 1
+
+def _line_end(buf, pos):
+    """Offset just past the newline ending the line containing pos"""
+    end = buf.find(b"\n", pos)
+    return len(buf) if end == -1 else end + 1
+
+def _lines_back(buf, line_start, count):
+    """Offset of the line 'count' lines above the line starting at line_start (stops at the top)"""
+    for _ in range(count):
+        if line_start == 0:
+            break
+        line_start = buf.rfind(b"\n", 0, line_start - 1) + 1
+    return line_start
+
+def _decode_lines(buf, start, end):
+    """Decode the whole lines in buf[start:end] into a list of strings"""
+    return buf[start:end].decode('utf-8', errors='replace').splitlines(keepends=True)
+
+def _find_machine_end_line(buf):
+    """Byte range of the first '; machine_end_gcode' line that contains '=', or None"""
+    pos = buf.find(_MACHINE_END_GCODE)
+    while pos != -1:
+        start, end = _line_start(buf, pos), _line_end(buf, pos)
+        if buf.find(b"=", start, end) != -1:
+            return start, end
+        pos = buf.find(_MACHINE_END_GCODE, end)
+    return None
+
+# Read size when streaming a G-code file for upload
+_UPLOAD_BLOCK_SIZE = 1 << 20  # 1MB
+
+def _open_source(source):
+    """Open an upload source for reading: a file path, or file contents held in memory"""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return open(source, 'rb')
+
+def _source_size(source):
+    """Size in bytes of an upload source (file path or contents)"""
+    if isinstance(source, bytes):
+        return len(source)
+    return os.path.getsize(source)
+
+def _file_md5(source):
+    """MD5 hex digest of an upload source, hashed incrementally without loading a file whole"""
+    with _open_source(source) as f:
+        return hashlib.file_digest(f, 'md5').hexdigest()
+
+# Multipart header for an Elegoo upload (or one chunk of it); the MD5 field is
+# only sent with the first chunk
+_UPLOAD_FIELDS_TMPL = (
+    '--{b}\r\nContent-Disposition: form-data; name="TotalSize"\r\n\r\n{size}\r\n'
+    '--{b}\r\nContent-Disposition: form-data; name="Uuid"\r\n\r\n{uuid}\r\n'
+    '--{b}\r\nContent-Disposition: form-data; name="Offset"\r\n\r\n{offset}\r\n'
+    '--{b}\r\nContent-Disposition: form-data; name="Check"\r\n\r\n{check}\r\n'
+)
+_UPLOAD_MD5_TMPL = '--{b}\r\nContent-Disposition: form-data; name="S-File-MD5"\r\n\r\n{md5}\r\n'
+_UPLOAD_FILE_TMPL = (
+    '--{b}\r\nContent-Disposition: form-data; name="File"; filename="{filename}"\r\n'
+    'Content-Type: application/octet-stream\r\n\r\n'
+)
+
+# Download read size (bytes)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# Copy buffer when no progress is shown
+DOWNLOAD_COPY_SIZE = 1024 * 1024
+
+class _ProgressReader:
+    """File-like wrapper that reports the running byte count after each read"""
+    
+    def __init__(self, raw, on_progress):
+        self.raw = raw
+        self.on_progress = on_progress
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        if data:
+            self.bytes_read += len(data)
+            self.on_progress(self.bytes_read)
+        return data
+
+# Minimum time between download/upload progress lines (seconds)
+PROGRESS_INTERVAL = 0.5
+
+# Files up to this size are downloaded, modified and uploaded in memory
+IN_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+
+# Job files downloaded and modified ahead of the one being uploaded
+PIPELINE_LOOKAHEAD = 2
+
+# Keep-alive pool shared by every download/upload to the printer
+HTTP_POOL_SIZE = 4
+HTTP_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3
+
+class _MultipartFileBody:
+    """
+    Multipart upload body streamed from its source: header, file bytes, trailer
+    
+    requests streams any iterable body; defining __len__ lets it send a
+    Content-Length instead of falling back to chunked transfer encoding.
+    Iterating re-opens the source, so the body can be posted again on retry.
+    """
+    
+    def __init__(self, head, file_path, file_size, tail):
+        self.head = head
+        self.file_path = file_path
+        self.file_size = file_size
+        self.tail = tail
+    
+    def __len__(self):
+        return len(self.head) + self.file_size + len(self.tail)
+    
+    def __iter__(self):
+        yield self.head
+        with _open_source(self.file_path) as f:
+            for chunk in iter(lambda: f.read(_UPLOAD_BLOCK_SIZE), b''):
+                yield chunk
+        yield self.tail
+
+class _MultipartChunkBody:
+    """
+    Multipart upload body for one chunk, sent part by part without joining
+    
+    The chunk part is a memoryview of the reused read buffer, so the chunk is
+    never copied into a combined bytes object before it reaches the socket.
+    """
+    
+    def __init__(self, *parts):
+        self.parts = parts
+    
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+    
+    def __iter__(self):
+        return iter(self.parts)
 
 class GCodeProcessor:
-    """Handles G-code file processing for various printer types"""
+    """
+    Handles G-code file processing for various printer types
+    
+    Meant to be used as a context manager around a whole batch: every download
+    and upload goes through one keep-alive HTTP session, opened with the
+    processor and closed on exit, so files after the first reuse the
+    printer connection.
+    """
     
     def __init__(self, printer_ip, printer_brand):
         self.printer_ip = printer_ip
         self.printer_brand = printer_brand.upper()
         self.logger = setup_logger()
         self.temp_dir = None
+        
+        # One session for the whole batch so every file reuses the printer connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                              max_retries=Retry(total=HTTP_RETRIES, backoff_factor=HTTP_RETRY_BACKOFF))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Resolve the brand-specific handlers once; None marks an unsupported brand
+        handlers = {
+            "ANYCUBIC": ("200", self._anycubic_download_url, self._modify_anycubic_gcode,
+                         self._anycubic_edits, self._upload_gcode_file_anycubic),
+            "ELEGOO": ("205", self._elegoo_download_url, self._modify_elegoo_gcode,
+                       self._elegoo_edits, self._upload_gcode_file_elegoo),
+        }
+        (self._z_position, self._download_url, self._modify,
+         self._find_edits, self._upload) = handlers.get(self.printer_brand, ("205", None, None, None, None))
+        
+        # Every letter-case spelling of the "Z<position> F600" command, for verification
+        self._z_markers = tuple(f"{z}{self._z_position} {f}600".encode('ascii') for z in "Zz" for f in "Ff")
     
     def __enter__(self):
         """Context manager entry - create temp directory"""
@@ -30,73 +277,80 @@ class GCodeProcessor:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - cleanup temp directory"""
+        """Context manager exit - close the HTTP session and cleanup temp directory"""
+        self._session.close()
+        
         if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
             try:
                 shutil.rmtree(self.temp_dir)
                 self.logger.debug(f"Cleaned up temporary directory: {self.temp_dir}")
             except Exception as e:
                 self.logger.warning(f"Failed to cleanup temp directory: {e}")
     
-    def download_gcode_file(self, filename, show_progress=True):
+    def download_gcode_file(self, filename, show_progress=True, dest_dir=None, max_in_memory=0,
+                            progress_gate=None):
         """
         Download a G-code file from the printer
         
         Args:
             filename: Name of the G-code file
             show_progress: Whether to show download progress
+            dest_dir: Directory to save into (defaults to the temp directory)
+            max_in_memory: Keep files with a known size up to this many bytes
+                in memory instead of writing them to disk (0 = always disk)
+            progress_gate: Optional threading.Event; when given, progress is
+                only shown while it is set
         
         Returns:
-            str: Path to downloaded file, or None if failed
+            str or bytes: Path to downloaded file, the file contents when kept
+                in memory, or None if failed
         """
         # Different download URLs for different printer brands
-        if self.printer_brand == "ANYCUBIC":
-            # Anycubic uses Moonraker API
-            encoded_filename = quote(filename)
-            download_url = f"http://{self.printer_ip}/server/files/gcodes/{encoded_filename}"
-        elif self.printer_brand == "ELEGOO":
-            # Elegoo uses /local/ endpoint
-            download_url = f"http://{self.printer_ip}/local/{filename}"
-        else:
+        if self._download_url is None:
             self.logger.error(f"Unsupported printer brand for G-code processing: {self.printer_brand}")
             return None
+        download_url = self._download_url(filename)
         
         self.logger.info(f"Downloading G-code file: {filename}")
         self.logger.debug(f"Download URL: {download_url}")
         
-        local_path = os.path.join(self.temp_dir, filename)
+        local_path = os.path.join(dest_dir or self.temp_dir, filename)
         
         try:
             # Start download
-            response = requests.get(download_url, stream=True, timeout=30)
+            response = self._session.get(download_url, stream=True, timeout=30)
             response.raise_for_status()
             
             # Get file size if available
             total_size = int(response.headers.get('content-length', 0))
             
-            downloaded_size = 0
-            chunk_size = 8192  # 8KB chunks
-            last_progress_update = 0
+            next_progress_time = 0.0
             
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        if show_progress and total_size > 0:
-                            progress = (downloaded_size / total_size) * 100
-                            # Update progress every 1MB or when complete
-                            if (downloaded_size - last_progress_update) >= (1024*1024) or progress >= 100:
-                                size_mb = downloaded_size / (1024*1024)
-                                total_mb = total_size / (1024*1024)
-                                print(f"    📥 {filename}: {size_mb:.1f}MB / {total_mb:.1f}MB ({progress:.1f}%)")
-                                last_progress_update = downloaded_size
+            def report_progress(downloaded_size):
+                nonlocal next_progress_time
+                if progress_gate is not None and not progress_gate.is_set():
+                    return
+                now = time.monotonic()
+                # Update progress at most every PROGRESS_INTERVAL seconds, and when complete
+                if now >= next_progress_time or downloaded_size >= total_size:
+                    print(f"    📥 {filename}: {downloaded_size / (1024*1024):.1f}MB / {total_size / (1024*1024):.1f}MB "
+                          f"({downloaded_size / total_size * 100:.1f}%)")
+                    next_progress_time = now + PROGRESS_INTERVAL
+            
+            # Copy the (decoded) body straight from the socket to memory or disk
+            in_memory = 0 < total_size <= max_in_memory
+            response.raw.decode_content = True
+            with (io.BytesIO() if in_memory else open(local_path, 'wb')) as f:
+                if show_progress and total_size > 0:
+                    shutil.copyfileobj(_ProgressReader(response.raw, report_progress), f, DOWNLOAD_CHUNK_SIZE)
+                else:
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_COPY_SIZE)
+                downloaded_size = f.tell()
+                result = f.getvalue() if in_memory else local_path
             
             final_size_mb = downloaded_size / (1024*1024)
             self.logger.info(f"✅ Downloaded {filename} ({final_size_mb:.1f}MB)")
-            return local_path
+            return result
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"❌ Failed to download {filename}: {e}")
@@ -105,6 +359,14 @@ class GCodeProcessor:
             self.logger.error(f"❌ Error downloading {filename}: {e}")
             return None
     
+    def _anycubic_download_url(self, filename):
+        """Anycubic uses Moonraker API"""
+        return f"http://{self.printer_ip}/server/files/gcodes/{quote(filename)}"
+    
+    def _elegoo_download_url(self, filename):
+        """Elegoo uses /local/ endpoint"""
+        return f"http://{self.printer_ip}/local/{filename}"
+    
     def _check_z_positioning_exists(self, lines, z_position, start_line=0, end_line=None):
         """
         Check if Z positioning command already exists in the given line range
@@ -121,20 +383,22 @@ class GCodeProcessor:
         """
         if end_line is None:
             end_line = len(lines)
+        end_line = min(end_line, len(lines))
         
-        # Create case-insensitive pattern for ANY Z positioning command
-        # Matches patterns like: G1 Z200, G1 Z200 F600, G1Z200F1500, g1 z200 f300, etc.
-        # This is more flexible and will catch existing commands with any F speed
-        pattern = rf'g1\s*z\s*{z_position}(?:\s*f\d+)?'
-        
-        for i in range(start_line, min(end_line, len(lines))):
-            # Clean line: remove spaces, semicolons, and convert to lowercase
-            line_clean = lines[i].replace(' ', '').replace(';', '').lower()
-            if re.search(pattern, line_clean):
-                self.logger.info(f"ℹ️  Z{z_position} positioning command already exists at line {i+1}: {lines[i].strip()}")
-                return True
+        # Case-insensitive pattern for ANY Z positioning command (any F speed),
+        # searched once across the whole window; matches never span lines
+        match = _get_z_line_pattern(z_position).search(''.join(lines[start_line:end_line]))
+        if not match:
+            return False
         
-        return False
+        # Walk the line lengths to find which line matched (for logging)
+        offset = match.start()
+        i = start_line
+        while offset >= len(lines[i]):
+            offset -= len(lines[i])
+            i += 1
+        self.logger.info(f"ℹ️  Z{z_position} positioning command already exists at line {i+1}: {lines[i].strip()}")
+        return True
     
     def _check_machine_end_gcode_has_z_command(self, machine_line, z_position):
         """
@@ -148,13 +412,13 @@ class GCodeProcessor:
         Returns:
             bool: True if Z positioning command exists, False otherwise
         """
-        # Create case-insensitive pattern for ANY Z positioning command in machine_end_gcode
+        # Case-insensitive pattern for ANY Z positioning command in machine_end_gcode
         # This handles escaped newlines like \\n and various formatting
-        pattern = rf'g1\s*z\s*{z_position}(?:\s*f\d+)?'
+        pattern = _get_z_pattern(z_position)
         
-        # Clean the line: handle escaped newlines, remove spaces, convert to lowercase
-        line_clean = machine_line.replace('\\n', ' ').replace(' ', '').lower()
-        if re.search(pattern, line_clean):
+        # Clean the line: handle escaped newlines and remove spaces
+        line_clean = machine_line.replace('\\n', ' ').replace(' ', '')
+        if pattern.search(line_clean):
             self.logger.info(f"ℹ️  Z{z_position} positioning command already exists in machine_end_gcode")
             return True
         
@@ -170,110 +434,138 @@ class GCodeProcessor:
         Returns:
             bool: True if modification successful, False otherwise
         """
-        if self.printer_brand == "ANYCUBIC":
-            return self._modify_anycubic_gcode(file_path)
-        elif self.printer_brand == "ELEGOO":
-            return self._modify_elegoo_gcode(file_path)
-        else:
+        if self._modify is None:
             self.logger.error(f"Unsupported printer brand for G-code modification: {self.printer_brand}")
             return False
+        return self._modify(file_path)
     
-    def _modify_anycubic_gcode(self, file_path):
+    def modify_gcode_data(self, data, filename):
         """
-        Modify Anycubic G-code file to add Z200 positioning commands
+        Modify G-code held in memory based on printer brand
         
         Args:
-            file_path: Path to the G-code file to modify
+            data: G-code file contents
+            filename: Name of the G-code file (for logging)
         
         Returns:
-            bool: True if modification successful, False otherwise
+            bytes: Modified file contents, or None if modification failed
         """
+        if self._find_edits is None:
+            self.logger.error(f"Unsupported printer brand for G-code modification: {self.printer_brand}")
+            return None
+        brand = self.printer_brand.title()
+        
         try:
-            self.logger.info(f"Modifying Anycubic G-code file: {os.path.basename(file_path)}")
+            self.logger.info(f"Modifying {brand} G-code file: {filename}")
+            edits = self._find_edits(data)
+            if edits is None:
+                return None
             
-            # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if not edits:
+                self.logger.info(f"ℹ️  No modifications needed for: {filename}")
+                return data
             
-            total_lines = len(lines)
-            self.logger.debug(f"File has {total_lines} lines")
+            parts = []
+            prev = 0
+            for start, end, replacement in sorted(edits):
+                parts += (data[prev:start], replacement)
+                prev = end
+            parts.append(data[prev:])
+            self.logger.info(f"✅ {brand} G-code file modified successfully: {filename}")
+            return b''.join(parts)
             
-            modified = False
-            
-            # 1. Find and modify the EXECUTABLE_BLOCK_END section
-            executable_block_line = None
-            for i in range(total_lines - 1, -1, -1):  # Search from bottom
-                if "; EXECUTABLE_BLOCK_END" in lines[i]:
-                    executable_block_line = i
-                    break
+        except Exception as e:
+            self.logger.error(f"❌ Error modifying {brand} G-code file: {e}")
+            return None
+    
+    def _write_edits(self, file_path, buf, edits):
+        """
+        Write buf back to file_path with edits applied
+        
+        The unchanged stretches are written straight from the buffer to a
+        temporary file next to file_path, which then replaces the original.
+        
+        Args:
+            file_path: Path of the file buf was read from
+            buf: File contents (bytes or mmap)
+            edits: List of (start, end, replacement) byte ranges, non-overlapping
+        """
+        fd, temp_path = tempfile.mkstemp(prefix=".ottomat3d_", dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with os.fdopen(fd, 'wb') as out, memoryview(buf) as view:
+                prev = 0
+                for start, end, replacement in sorted(edits):
+                    out.write(view[prev:start])
+                    out.write(replacement)
+                    prev = end
+                out.write(view[prev:])
             
-            if executable_block_line is not None:
-                # Check if Z200 positioning already exists in the EXECUTABLE_BLOCK_END section
-                section_start = max(0, executable_block_line - 20)
-                if self._check_z_positioning_exists(lines, "200", section_start, executable_block_line):
-                    self.logger.info("ℹ️  Z200 command already exists in EXECUTABLE_BLOCK_END section")
-                else:
-                    # Find the Y270 throw_position_y line and insert Z200 AFTER it
-                    y270_line = None
-                    for j in range(max(0, executable_block_line - 15), executable_block_line):
-                        if "G1 Y270" in lines[j] and "throw_position_y" in lines[j]:
-                            y270_line = j
-                            break
-                    
-                    if y270_line is not None:
-                        # Insert Z200 command right after Y270 line
-                        lines.insert(y270_line + 1, "G1 Z200 F600;\n")
-                        self.logger.info("✅ Added Z200 command after Y270 throw_position_y")
-                        modified = True
-                    else:
-                        self.logger.warning("⚠️  Could not find 'G1 Y270; throw_position_y' line before EXECUTABLE_BLOCK_END")
-            else:
-                self.logger.error("❌ Could not find '; EXECUTABLE_BLOCK_END' in G-code file")
-                return False
+            # The mapping must be released before the file is replaced
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _modify_mapped_gcode(self, file_path, brand, find_edits):
+        """
+        Map a G-code file, find its edits and write them back in place
+        
+        Only the lines around the markers are decoded; the file itself is
+        mapped and searched as bytes.
+        
+        Args:
+            file_path: Path to the G-code file to modify
+            brand: Printer brand name for log messages
+            find_edits: Edit finder for the brand (_anycubic_edits / _elegoo_edits)
+        
+        Returns:
+            bool: True if modification successful, False otherwise
+        """
+        try:
+            self.logger.info(f"Modifying {brand} G-code file: {os.path.basename(file_path)}")
             
-            # 2. Find and modify the machine_end_gcode section
-            machine_end_line = None
-            for i, line in enumerate(lines):
-                if "; machine_end_gcode" in line and "=" in line:
-                    machine_end_line = i
-                    break
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self.logger.error("❌ Could not find '; EXECUTABLE_BLOCK_END' in G-code file")
+                    return False
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             
-            if machine_end_line is not None:
-                # Use the improved checking function for machine_end_gcode
-                if self._check_machine_end_gcode_has_z_command(lines[machine_end_line], "200"):
-                    self.logger.info("ℹ️  Z200 command already exists in machine_end_gcode")
+            try:
+                edits = find_edits(buf)
+                if edits is None:
+                    return False
+                
+                # Write the modified file back
+                if edits:
+                    self._write_edits(file_path, buf, edits)
+                    self.logger.info(f"✅ {brand} G-code file modified successfully: {os.path.basename(file_path)}")
                 else:
-                    # Modify the machine_end_gcode line
-                    original_line = lines[machine_end_line]
-                    
-                    # Add Z200 command AFTER Y270 positioning (correct order)
-                    if "G1 Y270; throw_position_y" in original_line:
-                        new_line = original_line.replace(
-                            "G1 Y270; throw_position_y",
-                            "G1 Y270; throw_position_y\\nG1 Z200 F600;"
-                        )
-                        lines[machine_end_line] = new_line
-                        self.logger.info("✅ Added Z200 command after Y270 in machine_end_gcode")
-                        modified = True
-                    else:
-                        self.logger.warning("⚠️  Could not find 'G1 Y270; throw_position_y' in machine_end_gcode")
-            else:
-                self.logger.warning("⚠️  Could not find 'machine_end_gcode' section")
-            
-            # Write the modified file back
-            if modified:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                self.logger.info(f"✅ Anycubic G-code file modified successfully: {os.path.basename(file_path)}")
-            else:
-                self.logger.info(f"ℹ️  No modifications needed for: {os.path.basename(file_path)}")
+                    self.logger.info(f"ℹ️  No modifications needed for: {os.path.basename(file_path)}")
+            finally:
+                if not buf.closed:
+                    buf.close()
             
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Error modifying Anycubic G-code file: {e}")
+            self.logger.error(f"❌ Error modifying {brand} G-code file: {e}")
             return False
     
+    def _modify_anycubic_gcode(self, file_path):
+        """
+        Modify Anycubic G-code file to add Z200 positioning commands
+        
+        Args:
+            file_path: Path to the G-code file to modify
+        
+        Returns:
+            bool: True if modification successful, False otherwise
+        """
+        return self._modify_mapped_gcode(file_path, "Anycubic", self._anycubic_edits)
+    
     def _modify_elegoo_gcode(self, file_path):
         """
         Modify Elegoo G-code file to add Z205 positioning commands
@@ -285,109 +577,151 @@ class GCodeProcessor:
         Returns:
             bool: True if modification successful, False otherwise
         """
-        try:
-            self.logger.info(f"Modifying Elegoo G-code file: {os.path.basename(file_path)}")
-            
-            # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            total_lines = len(lines)
-            self.logger.debug(f"File has {total_lines} lines")
-            
-            modified = False
-            
-            # 1. Find and modify the EXECUTABLE_BLOCK_END section
-            executable_block_line = None
-            for i in range(total_lines - 1, -1, -1):  # Search from bottom
-                if "; EXECUTABLE_BLOCK_END" in lines[i]:
-                    executable_block_line = i
+        return self._modify_mapped_gcode(file_path, "Elegoo", self._elegoo_edits)
+    
+    def _anycubic_edits(self, buf):
+        """
+        Find the edits that add Z200 positioning commands to Anycubic G-code
+        
+        Args:
+            buf: G-code file contents (bytes or mmap)
+        
+        Returns:
+            list: (start, end, replacement) byte ranges, or None if the file
+                cannot be modified
+        """
+        edits = []
+        
+        # 1. Find and modify the EXECUTABLE_BLOCK_END section (last occurrence)
+        marker = buf.rfind(_EXECUTABLE_BLOCK_END)
+        if marker == -1:
+            self.logger.error("❌ Could not find '; EXECUTABLE_BLOCK_END' in G-code file")
+            return None
+        block_end = _line_start(buf, marker)
+        
+        # Check if Z200 positioning already exists in the EXECUTABLE_BLOCK_END section
+        # (probe the raw bytes first; the lines are only decoded on a candidate match)
+        section_start = _lines_back(buf, block_end, 20)
+        if (_get_z_probe("200").search(buf, section_start, block_end)
+                and self._check_z_positioning_exists(_decode_lines(buf, section_start, block_end), "200")):
+            self.logger.info("ℹ️  Z200 command already exists in EXECUTABLE_BLOCK_END section")
+        else:
+            # Find the Y270 throw_position_y line and insert Z200 AFTER it
+            # (jump between "G1 Y270" occurrences instead of walking every line)
+            insert_at = None
+            pos = buf.find(b"G1 Y270", _lines_back(buf, block_end, 15), block_end)
+            while pos != -1:
+                end = _line_end(buf, pos)
+                if buf.find(b"throw_position_y", _line_start(buf, pos), end) != -1:
+                    insert_at = end
                     break
+                pos = buf.find(b"G1 Y270", end, block_end)
             
-            if executable_block_line is not None:
-                # Check if Z205 positioning already exists in the EXECUTABLE_BLOCK_END section
-                section_start = max(0, executable_block_line - 20)
-                if self._check_z_positioning_exists(lines, "205", section_start, executable_block_line):
-                    self.logger.info("ℹ️  Z205 command already exists in EXECUTABLE_BLOCK_END section")
-                else:
-                    # Insert Z205 command 8 lines above EXECUTABLE_BLOCK_END (after M400, before G92 E0)
-                    insert_line = max(0, executable_block_line - 8)
-                    lines.insert(insert_line, "G1 Z205 F600\n")
-                    self.logger.info("✅ Added Z205 command 8 lines before EXECUTABLE_BLOCK_END")
-                    modified = True
+            if insert_at is not None:
+                # Insert Z200 command right after Y270 line
+                edits.append((insert_at, insert_at, b"G1 Z200 F600;\n"))
+                self.logger.info("✅ Added Z200 command after Y270 throw_position_y")
             else:
-                self.logger.error("❌ Could not find '; EXECUTABLE_BLOCK_END' in G-code file")
-                return False
-            
-            # 2. Find and modify the machine_end_gcode section
-            machine_end_line = None
-            for i, line in enumerate(lines):
-                if "; machine_end_gcode" in line and "=" in line:
-                    machine_end_line = i
-                    break
-            
-            if machine_end_line is not None:
-                # Use the improved checking function for machine_end_gcode
-                if self._check_machine_end_gcode_has_z_command(lines[machine_end_line], "205"):
-                    self.logger.info("ℹ️  Z205 command already exists in machine_end_gcode")
-                else:
-                    # For machine_end_gcode, we need to add it in the right position
-                    # Look for M400 pattern and add Z205 after it
-                    original_line = lines[machine_end_line]
-                    
-                    # Add Z205 command after M400 pattern in the machine end gcode
-                    if "M400\\n" in original_line:
-                        new_line = original_line.replace(
-                            "M400\\n",
-                            "M400\\nG1 Z205 F600\\n"
-                        )
-                        lines[machine_end_line] = new_line
-                        self.logger.info("✅ Added Z205 command after M400 in machine_end_gcode")
-                        modified = True
-                    else:
-                        self.logger.warning("⚠️  Could not find 'M400' pattern in machine_end_gcode")
+                self.logger.warning("⚠️  Could not find 'G1 Y270; throw_position_y' line before EXECUTABLE_BLOCK_END")
+        
+        # 2. Find and modify the machine_end_gcode section
+        machine_end = _find_machine_end_line(buf)
+        if machine_end is not None:
+            original_line = buf[machine_end[0]:machine_end[1]].decode('utf-8', errors='replace')
+            # Use the improved checking function for machine_end_gcode
+            if self._check_machine_end_gcode_has_z_command(original_line, "200"):
+                self.logger.info("ℹ️  Z200 command already exists in machine_end_gcode")
+            # Add Z200 command AFTER Y270 positioning (correct order)
+            elif "G1 Y270; throw_position_y" in original_line:
+                new_line = original_line.replace(
+                    "G1 Y270; throw_position_y",
+                    "G1 Y270; throw_position_y\\nG1 Z200 F600;"
+                )
+                edits.append((*machine_end, new_line.encode('utf-8')))
+                self.logger.info("✅ Added Z200 command after Y270 in machine_end_gcode")
             else:
-                self.logger.warning("⚠️  Could not find 'machine_end_gcode' section")
-            
-            # Write the modified file back
-            if modified:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                self.logger.info(f"✅ Elegoo G-code file modified successfully: {os.path.basename(file_path)}")
+                self.logger.warning("⚠️  Could not find 'G1 Y270; throw_position_y' in machine_end_gcode")
+        else:
+            self.logger.warning("⚠️  Could not find 'machine_end_gcode' section")
+        
+        return edits
+    
+    def _elegoo_edits(self, buf):
+        """
+        Find the edits that add Z205 positioning commands to Elegoo G-code
+        
+        Args:
+            buf: G-code file contents (bytes or mmap)
+        
+        Returns:
+            list: (start, end, replacement) byte ranges, or None if the file
+                cannot be modified
+        """
+        edits = []
+        
+        # 1. Find and modify the EXECUTABLE_BLOCK_END section (last occurrence)
+        marker = buf.rfind(_EXECUTABLE_BLOCK_END)
+        if marker == -1:
+            self.logger.error("❌ Could not find '; EXECUTABLE_BLOCK_END' in G-code file")
+            return None
+        block_end = _line_start(buf, marker)
+        
+        # Check if Z205 positioning already exists in the EXECUTABLE_BLOCK_END section
+        # (probe the raw bytes first; the lines are only decoded on a candidate match)
+        section_start = _lines_back(buf, block_end, 20)
+        if (_get_z_probe("205").search(buf, section_start, block_end)
+                and self._check_z_positioning_exists(_decode_lines(buf, section_start, block_end), "205")):
+            self.logger.info("ℹ️  Z205 command already exists in EXECUTABLE_BLOCK_END section")
+        else:
+            # Insert Z205 command 8 lines above EXECUTABLE_BLOCK_END (after M400, before G92 E0)
+            insert_at = _lines_back(buf, block_end, 8)
+            edits.append((insert_at, insert_at, b"G1 Z205 F600\n"))
+            self.logger.info("✅ Added Z205 command 8 lines before EXECUTABLE_BLOCK_END")
+        
+        # 2. Find and modify the machine_end_gcode section
+        machine_end = _find_machine_end_line(buf)
+        if machine_end is not None:
+            original_line = buf[machine_end[0]:machine_end[1]].decode('utf-8', errors='replace')
+            # Use the improved checking function for machine_end_gcode
+            if self._check_machine_end_gcode_has_z_command(original_line, "205"):
+                self.logger.info("ℹ️  Z205 command already exists in machine_end_gcode")
+            # Add Z205 command after M400 pattern in the machine end gcode
+            elif "M400\\n" in original_line:
+                new_line = original_line.replace(
+                    "M400\\n",
+                    "M400\\nG1 Z205 F600\\n"
+                )
+                edits.append((*machine_end, new_line.encode('utf-8')))
+                self.logger.info("✅ Added Z205 command after M400 in machine_end_gcode")
             else:
-                self.logger.info(f"ℹ️  No modifications needed for: {os.path.basename(file_path)}")
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error modifying Elegoo G-code file: {e}")
-            return False
+                self.logger.warning("⚠️  Could not find 'M400' pattern in machine_end_gcode")
+        else:
+            self.logger.warning("⚠️  Could not find 'machine_end_gcode' section")
+        
+        return edits
     
     def upload_gcode_file(self, file_path, filename):
         """
         Upload G-code file based on printer brand
         
         Args:
-            file_path: Local path to the file to upload
+            file_path: Local path to the file to upload, or its contents in memory
             filename: Target filename on printer
         
         Returns:
             bool: True if upload successful, False otherwise
         """
-        if self.printer_brand == "ANYCUBIC":
-            return self._upload_gcode_file_anycubic(file_path, filename)
-        elif self.printer_brand == "ELEGOO":
-            return self._upload_gcode_file_elegoo(file_path, filename)
-        else:
+        if self._upload is None:
             self.logger.error(f"Unsupported printer brand for G-code upload: {self.printer_brand}")
             return False
+        return self._upload(file_path, filename)
     
     def _upload_gcode_file_anycubic(self, file_path, filename):
         """
         Upload G-code file to Anycubic printer via Moonraker API
         
         Args:
-            file_path: Local path to the file to upload
+            file_path: Local path to the file to upload, or its contents in memory
             filename: Target filename on printer
         
         Returns:
@@ -399,11 +733,11 @@ class GCodeProcessor:
         
         try:
             # Get file size for progress
-            file_size = os.path.getsize(file_path)
+            file_size = _source_size(file_path)
             file_size_mb = file_size / (1024*1024)
             
             # Prepare multipart form data
-            with open(file_path, 'rb') as f:
+            with _open_source(file_path) as f:
                 files = {
                     'file': (filename, f, 'application/octet-stream')
                 }
@@ -415,7 +749,7 @@ class GCodeProcessor:
                 }
                 
                 print(f"    📤 Uploading {filename} ({file_size_mb:.1f}MB)...")
-                response = requests.post(upload_url, files=files, data=data, timeout=120)
+                response = self._session.post(upload_url, files=files, data=data, timeout=120)
                 response.raise_for_status()
                 
                 # Check response
@@ -440,7 +774,7 @@ class GCodeProcessor:
         Handles large files with chunked upload and better error handling
         
         Args:
-            file_path: Local path to the file to upload
+            file_path: Local path to the file to upload, or its contents in memory
             filename: Target filename on printer
         
         Returns:
@@ -451,35 +785,34 @@ class GCodeProcessor:
         self.logger.info(f"Uploading modified G-code to Elegoo: {filename}")
         
         try:
-            # Read the file
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            file_size = len(file_content)
+            file_size = _source_size(file_path)
             file_size_mb = file_size / (1024*1024)
             
             # For large files (>2MB), try chunked approach first
             if file_size > 2 * 1024 * 1024:  # 2MB threshold
                 self.logger.info(f"Large file detected ({file_size_mb:.1f}MB), using chunked upload...")
-                if self._upload_elegoo_chunked(file_content, filename, upload_url):
+                if self._upload_elegoo_chunked(file_path, filename, upload_url):
                     return True
                 else:
                     self.logger.warning("Chunked upload failed, falling back to single request...")
             
             # Single request upload (original method but with improvements)
-            return self._upload_elegoo_single_request(file_content, filename, upload_url)
+            return self._upload_elegoo_single_request(file_path, filename, upload_url)
                 
         except Exception as e:
             self.logger.error(f"❌ Error uploading {filename}: {e}")
             return False
     
-    def _upload_elegoo_chunked(self, file_content, filename, upload_url):
+    def _upload_elegoo_chunked(self, file_path, filename, upload_url):
         """
         Upload large files to Elegoo using chunked approach
+        
+        Chunks are read from the file as they are sent, so only one chunk of
+        the file is held in memory at a time.
         """
-        file_size = len(file_content)
+        file_size = _source_size(file_path)
         chunk_size = 1024 * 1024  # 1MB chunks
-        md5_hash = hashlib.md5(file_content).hexdigest()
+        md5_hash = _file_md5(file_path)
         upload_uuid = str(uuid.uuid4()).replace('-', '')
         
         print(f"    📤 Uploading {filename} in chunks ({file_size/1024/1024:.1f}MB)...")
@@ -489,81 +822,75 @@ class GCodeProcessor:
         chunk_num = 0
         total_chunks = (file_size + chunk_size - 1) // chunk_size
         
-        while offset < file_size:
-            chunk_end = min(offset + chunk_size, file_size)
-            chunk_data = file_content[offset:chunk_end]
-            chunk_num += 1
-            
-            # Create boundary for this chunk
-            boundary = f"----webkitformboundary{upload_uuid}{chunk_num:04d}"
-            
-            # Build multipart body for this chunk
-            body_parts = []
-            
-            # Add form fields
-            fields = {
-                'TotalSize': str(file_size),
-                'Uuid': upload_uuid,
-                'Offset': str(offset),
-                'Check': '1' if offset == 0 else '0',  # Only check on first chunk
-                'S-File-MD5': md5_hash if offset == 0 else ''  # Only send MD5 on first chunk
-            }
-            
-            for field_name, field_value in fields.items():
-                if field_value:  # Only add non-empty fields
-                    body_parts.append(f'--{boundary}')
-                    body_parts.append(f'Content-Disposition: form-data; name="{field_name}"')
-                    body_parts.append('')
-                    body_parts.append(field_value)
-            
-            # Add file chunk
-            body_parts.append(f'--{boundary}')
-            body_parts.append(f'Content-Disposition: form-data; name="File"; filename="{filename}"')
-            body_parts.append('Content-Type: application/octet-stream')
-            body_parts.append('')
+        next_progress_time = 0.0
+        
+        # Every chunk is read into the same buffer and sent from a view of it
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        
+        with _open_source(file_path) as f:
+            while offset < file_size:
+                read_size = f.readinto(buffer)
+                if not read_size:
+                    self.logger.error(f"Chunk {chunk_num + 1} failed: file ended early")
+                    return False
+                chunk_data = view[:read_size]
+                chunk_end = offset + read_size
+                chunk_num += 1
             
-            # Join text parts
-            body_text = '\r\n'.join(body_parts) + '\r\n'
+                # Create boundary for this chunk
+                boundary = f"----webkitformboundary{upload_uuid}{chunk_num:04d}"
             
-            # Create final body with chunk content
-            body = body_text.encode('utf-8') + chunk_data + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+                # Build multipart body for this chunk
+                header = _UPLOAD_FIELDS_TMPL.format(b=boundary, size=file_size, uuid=upload_uuid,
+                                                    offset=offset, check='1' if offset == 0 else '0')
+                if offset == 0:  # Only send MD5 on first chunk
+                    header += _UPLOAD_MD5_TMPL.format(b=boundary, md5=md5_hash)
+                header += _UPLOAD_FILE_TMPL.format(b=boundary, filename=filename)
+                trailer = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+                body = _MultipartChunkBody(header.encode('utf-8'), chunk_data, trailer)
             
-            # Upload headers
-            headers = {
-                'Content-Type': f'multipart/form-data; boundary={boundary}',
-                'Content-Length': str(len(body))
-            }
+                # Upload headers
+                headers = {
+                    'Content-Type': f'multipart/form-data; boundary={boundary}',
+                    'Content-Length': str(len(body))
+                }
             
-            # Show progress
-            progress = (chunk_num / total_chunks) * 100
-            print(f"    📤 Chunk {chunk_num}/{total_chunks} ({progress:.1f}%)...")
+                # Show progress at most every PROGRESS_INTERVAL seconds, and for the last chunk
+                now = time.monotonic()
+                if now >= next_progress_time or chunk_num == total_chunks:
+                    print(f"    📤 Chunk {chunk_num}/{total_chunks} ({chunk_num / total_chunks * 100:.1f}%)...")
+                    next_progress_time = now + PROGRESS_INTERVAL
             
-            try:
-                response = requests.post(upload_url, data=body, headers=headers, timeout=60)
+                try:
+                    response = self._session.post(upload_url, data=body, headers=headers, timeout=60)
                 
-                if response.status_code != 200:
-                    self.logger.error(f"Chunk {chunk_num} failed: HTTP {response.status_code}")
-                    return False
+                    if response.status_code != 200:
+                        self.logger.error(f"Chunk {chunk_num} failed: HTTP {response.status_code}")
+                        return False
                     
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"Chunk {chunk_num} failed: {e}")
-                return False
+                except requests.exceptions.RequestException as e:
+                    self.logger.error(f"Chunk {chunk_num} failed: {e}")
+                    return False
             
-            offset = chunk_end
+                offset = chunk_end
         
         print(f"    ✅ All {total_chunks} chunks uploaded successfully!")
         self.logger.info(f"✅ Chunked upload successful: {filename}")
         return True
     
-    def _upload_elegoo_single_request(self, file_content, filename, upload_url):
+    def _upload_elegoo_single_request(self, file_path, filename, upload_url):
         """
         Upload file using single request (improved version of original method)
+        
+        The multipart body is streamed from the file, so only one block of the
+        file is held in memory while it is sent.
         """
-        file_size = len(file_content)
+        file_size = _source_size(file_path)
         file_size_mb = file_size / (1024*1024)
         
         # Calculate MD5 hash
-        md5_hash = hashlib.md5(file_content).hexdigest()
+        md5_hash = _file_md5(file_path)
         
         # Generate UUID for upload
         upload_uuid = str(uuid.uuid4()).replace('-', '')
@@ -571,40 +898,34 @@ class GCodeProcessor:
         # Use a simpler boundary format that matches browser behavior more closely
         boundary = f"----formdata-polyfill-{upload_uuid}"
         
-        # Build multipart body with exact browser-like formatting
-        body_parts = []
-        
-        # Add form fields with exact spacing
-        fields = {
-            'TotalSize': str(file_size),
-            'Uuid': upload_uuid,
-            'Offset': '0',
-            'Check': '1',
-            'S-File-MD5': md5_hash
-        }
-        
-        for field_name, field_value in fields.items():
-            body_parts.append(f'--{boundary}')
-            body_parts.append(f'Content-Disposition: form-data; name="{field_name}"')
-            body_parts.append('')
-            body_parts.append(field_value)
-        
-        # Add file with exact browser-like formatting
-        body_parts.append(f'--{boundary}')
-        body_parts.append(f'Content-Disposition: form-data; name="File"; filename="{filename}"')
-        body_parts.append('Content-Type: application/octet-stream')
-        body_parts.append('')
-        
-        # Join text parts
-        body_text = '\r\n'.join(body_parts) + '\r\n'
-        
-        # Create final body with file content
-        body = body_text.encode('utf-8') + file_content + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        if MultipartEncoder is not None:
+            # requests-toolbelt streams the same fields straight from the source
+            source = _open_source(file_path)
+            body = MultipartEncoder(fields=[
+                ('TotalSize', str(file_size)),
+                ('Uuid', upload_uuid),
+                ('Offset', '0'),
+                ('Check', '1'),
+                ('S-File-MD5', md5_hash),
+                ('File', (filename, source, 'application/octet-stream')),
+            ], boundary=boundary)
+            content_length = body.len
+        else:
+            # Build multipart header and trailer with exact browser-like formatting
+            source = None
+            head = (_UPLOAD_FIELDS_TMPL.format(b=boundary, size=file_size, uuid=upload_uuid, offset=0, check='1')
+                    + _UPLOAD_MD5_TMPL.format(b=boundary, md5=md5_hash)
+                    + _UPLOAD_FILE_TMPL.format(b=boundary, filename=filename)).encode('utf-8')
+            tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+            content_length = len(head) + file_size + len(tail)
+            
+            # Stream the file between the multipart header and trailer
+            body = _MultipartFileBody(head, file_path, file_size, tail)
         
         # Upload headers with additional browser-like headers
         headers = {
             'Content-Type': f'multipart/form-data; boundary={boundary}',
-            'Content-Length': str(len(body)),
+            'Content-Length': str(content_length),
             'Connection': 'keep-alive',
             'Accept': '*/*'
         }
@@ -612,10 +933,10 @@ class GCodeProcessor:
         print(f"    📤 Uploading {filename} ({file_size_mb:.1f}MB)...")
         
         try:
-            # Use longer timeout for large files and add retry logic
-            timeout = max(180, file_size_mb * 30)  # At least 30 seconds per MB
+            # Use longer timeout for large files: at least 30 seconds per started MB
+            timeout = max(180, ((file_size + 0xFFFFF) >> 20) * 30)
             
-            response = requests.post(upload_url, data=body, headers=headers, timeout=timeout)
+            response = self._session.post(upload_url, data=body, headers=headers, timeout=timeout)
             
             if response.status_code == 200:
                 self.logger.info(f"✅ Upload successful: {filename}")
@@ -638,11 +959,83 @@ class GCodeProcessor:
         except Exception as e:
             self.logger.error(f"❌ Upload error: {e}")
             return False
+        finally:
+            if source is not None:
+                source.close()
+    
+    def _prepare_job_file(self, file_number, filename, progress_gate=None):
+        """
+        Download and modify one job file
+        
+        Files up to IN_MEMORY_MAX_SIZE never touch the disk; larger ones go to
+        the file's own folder of the temp directory. Runs on the preprocessing
+        worker thread, so download progress is only printed once the caller
+        sets progress_gate to show it is waiting for this file.
+        
+        Args:
+            file_number: 1-based position of the file among the distinct job files
+            filename: Name of the G-code file
+            progress_gate: threading.Event that switches download progress on
+        
+        Returns:
+            tuple: (local_path or file contents, None, verified) on success, where
+                verified tells whether the Z command is present, or
+                (None, "download"/"modification", False) on failure
+        """
+        file_dir = os.path.join(self.temp_dir, str(file_number))
+        os.makedirs(file_dir, exist_ok=True)
+        
+        local_path = self.download_gcode_file(filename, show_progress=progress_gate is not None,
+                                              dest_dir=file_dir, max_in_memory=IN_MEMORY_MAX_SIZE,
+                                              progress_gate=progress_gate)
+        if local_path is None:
+            return None, "download", False
+        
+        if isinstance(local_path, bytes):
+            local_path = self.modify_gcode_data(local_path, filename)
+            if local_path is None:
+                return None, "modification", False
+        elif not self.modify_gcode_file(local_path):
+            return None, "modification", False
+        
+        return local_path, None, self._z_command_present(local_path)
+    
+    def _z_command_present(self, source):
+        """
+        Check whether modified G-code contains the "Z<position> F600" command
+        
+        Each case variant is searched for directly in the bytes (mapped for
+        files on disk), so no upper-cased copy of the file is ever made. Even
+        with all four variants missing, these literal finds beat a single
+        case-insensitive regex search over the same buffer several times over.
+        
+        Args:
+            source: Path to the modified file, or its contents in memory
+        
+        Returns:
+            bool: True if the command is present (any case)
+        """
+        if isinstance(source, bytes):
+            return any(marker in source for marker in self._z_markers)
+        
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return any(buf.find(marker) != -1 for marker in self._z_markers)
     
     def process_job_files(self, job_filenames):
         """
         Process all G-code files for automation sequence
         
+        Uploads run one at a time in job order on the calling thread, while a
+        worker downloads, modifies and verifies the next files, so each upload
+        overlaps the preparation of the files after it. Each distinct filename
+        is prepared once, before its first upload, and that result is uploaded
+        for every job that prints it - the printer's copy is never fetched
+        while it is being overwritten. The first failure stops processing and
+        cancels any preparation not yet started.
+        
         Args:
             job_filenames: List of G-code filenames to process
         
@@ -650,61 +1043,98 @@ class GCodeProcessor:
             bool: True if all files processed successfully, False otherwise
         """
         brand_display = self.printer_brand.title()
-        z_position = "Z200" if self.printer_brand == "ANYCUBIC" else "Z205"
+        z_position = f"Z{self._z_position}"
         
         self.logger.info(f"🔄 Starting G-code file processing for {brand_display} printer...")
-        print(f"\n🔄 {brand_display.upper()} G-CODE PREPROCESSING:")
-        print("─" * 45)
-        print(f"Downloading, modifying, and uploading G-code files to add {z_position} positioning...")
-        print("This ensures proper bed positioning during automation.")
-        print()
+        emit(
+            f"\n🔄 {brand_display.upper()} G-CODE PREPROCESSING:",
+            DIV[45],
+            f"Downloading, modifying, and uploading G-code files to add {z_position} positioning...",
+            "This ensures proper bed positioning during automation.",
+            ""
+        )
         
         total_files = len(job_filenames)
         processed_files = 0
         
-        for i, filename in enumerate(job_filenames, 1):
-            print(f"📋 Processing file {i}/{total_files}: {filename}")
-            print("─" * 50)
-            
-            # Step 1: Download
-            print(f"  📥 Step 1/3: Downloading {filename}...")
-            local_path = self.download_gcode_file(filename, show_progress=True)
-            if not local_path:
-                print(f"  ❌ Download failed for {filename}")
-                self.logger.error(f"G-code processing stopped due to download failure: {filename}")
-                return False
-            
-            # Step 2: Modify
-            print(f"  ✏️  Step 2/3: Modifying G-code...")
-            if not self.modify_gcode_file(local_path):
-                print(f"  ❌ Modification failed for {filename}")
-                self.logger.error(f"G-code processing stopped due to modification failure: {filename}")
-                return False
-            
-            # Check if file was actually modified (to show appropriate message)
-            with open(local_path, 'r', encoding='utf-8') as f:
-                modified_content = f.read()
-            
-            if f"{z_position} F600" in modified_content.upper():
-                print(f"    ✅ {z_position} positioning commands verified in file")
-            else:
-                print(f"    ⚠️  Could not verify {z_position} commands in modified file")
-            
-            # Step 3: Upload
-            print(f"  📤 Step 3/3: Uploading modified file...")
-            if not self.upload_gcode_file(local_path, filename):
-                print(f"  ❌ Upload failed for {filename}")
-                self.logger.error(f"G-code processing stopped due to upload failure: {filename}")
-                return False
-            
-            processed_files += 1
-            print(f"  ✅ Successfully processed {filename}")
-            print()
-        
-        print(f"🎉 G-code preprocessing completed successfully!")
-        print(f"   Processed {processed_files}/{total_files} files")
-        print(f"   All files now have {z_position} positioning commands")
-        print()
+        # Distinct files in first-use order, and the last job that uses each
+        file_numbers = {}
+        for filename in job_filenames:
+            file_numbers.setdefault(filename, len(file_numbers))
+        distinct_files = list(file_numbers)
+        last_job = {filename: i for i, filename in enumerate(job_filenames, 1)}
+        
+        # Distinct files are downloaded and modified on a worker thread, up to
+        # PIPELINE_LOOKAHEAD files ahead, while the current file uploads
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gcode_prep")
+        prepared = {}  # filename -> (future, progress gate)
+        next_submit = 0
+        uploaded = set()
+        
+        try:
+            for i, filename in enumerate(job_filenames, 1):
+                submit_until = min(file_numbers[filename] + PIPELINE_LOOKAHEAD, len(distinct_files) - 1)
+                while next_submit <= submit_until:
+                    ahead = distinct_files[next_submit]
+                    gate = threading.Event()
+                    future = executor.submit(self._prepare_job_file, next_submit + 1, ahead, gate)
+                    prepared[ahead] = (future, gate)
+                    next_submit += 1
+                
+                future, gate = prepared[filename]
+                if filename in uploaded:
+                    step_one = f"  📥 Step 1/3: Reusing {filename} prepared for an earlier job"
+                else:
+                    step_one = f"  📥 Step 1/3: Downloading {filename}..."
+                emit(f"📋 Processing file {i}/{total_files}: {filename}", DIV[50], step_one)
+                
+                # Let the worker print download progress while we wait on it
+                gate.set()
+                local_path, failed_step, verified = future.result()
+                self.logger.debug("Processing %s: failed_step=%s verified=%s", filename, failed_step, verified)
+                
+                if failed_step == "download":
+                    print(f"  ❌ Download failed for {filename}")
+                    self.logger.error(f"G-code processing stopped due to download failure: {filename}")
+                    return False
+                
+                lines = [f"  ✏️  Step 2/3: Modifying G-code..."]
+                if failed_step == "modification":
+                    emit(*lines, f"  ❌ Modification failed for {filename}")
+                    self.logger.error(f"G-code processing stopped due to modification failure: {filename}")
+                    return False
+                
+                # Check if file was actually modified (to show appropriate message;
+                # checked on the worker against the buffer it just produced)
+                if verified:
+                    lines.append(f"    ✅ {z_position} positioning commands verified in file")
+                else:
+                    lines.append(f"    ⚠️  Could not verify {z_position} commands in modified file")
+                
+                lines.append(f"  📤 Step 3/3: Uploading modified file...")
+                emit(*lines)
+                if not self.upload_gcode_file(local_path, filename):
+                    print(f"  ❌ Upload failed for {filename}")
+                    self.logger.error(f"G-code processing stopped due to upload failure: {filename}")
+                    return False
+                
+                processed_files += 1
+                uploaded.add(filename)
+                emit(f"  ✅ Successfully processed {filename}", "")
+                
+                # Release in-memory contents once no later job needs them
+                if last_job[filename] == i:
+                    del prepared[filename]
+        finally:
+            # Stop preparing further files once processing ends or fails
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        emit(
+            f"🎉 G-code preprocessing completed successfully!",
+            f"   Processed {processed_files}/{total_files} files",
+            f"   All files now have {z_position} positioning commands",
+            ""
+        )
         
         self.logger.info(f"✅ Successfully processed all {processed_files} G-code files")
         return True
@@ -3,13 +3,21 @@ Logging Utility for OTTOMAT3D Master Script
 Provides structured logging to both console and file
 """
 
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 import platform
+import time
 from datetime import datetime
 from pathlib import Path
 
+# Log file write buffer (bytes)
+LOG_BUFFER_SIZE = 64 * 1024
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors for console output"""
     
@@ -23,25 +31,65 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'       # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Colored level names, built once; format strings use %(level_colored)s
+        reset = self.COLORS['RESET']
+        self._colored = {
+            level: f"{color}{level}{reset}"
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+    
     def format(self, record):
-        # Add color to levelname
-        levelname = record.levelname
-        if levelname in self.COLORS:
-            colored_levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
-            record.levelname = colored_levelname
-        
-        # Format the message
-        formatted = super().format(record)
-        
-        # Reset levelname for file logging
-        record.levelname = levelname
-        
-        return formatted
+        # Only adds an attribute - record.levelname is left alone for other handlers
+        record.level_colored = self._colored.get(record.levelname, record.levelname)
+        return super().format(record)
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that batches writes instead of flushing after every record
+    
+    Records collect in a block-buffered stream. The handler itself only writes;
+    _DrainFlushQueueListener flushes it whenever the log queue runs empty, so a
+    burst of records costs one flush and nothing waits in the buffer once the
+    burst has been written.
+    """
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        # StreamHandler.emit without its unconditional flush
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
+class _DrainFlushQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers each time the queue is drained"""
+    
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            # Everything queued so far is handled - put it on disk before idling
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name="OTTOMAT3D", log_level=logging.INFO):
     """
     Set up a logger with both console and file output
     
+    Cached - repeated calls (every printer, controller and operation calls this)
+    return the already configured logger without redoing any setup work.
+    
     Args:
         name: Logger name
         log_level: Logging level (default: INFO)
@@ -80,18 +128,23 @@ def setup_logger(name="OTTOMAT3D", log_level=logging.INFO):
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # File handler (buffered; flushed whenever the log queue drains and at exit)
+    file_handler = BufferedFileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)  # File gets all messages
     
-    # Formatters
-    console_format = "%(levelname)s %(asctime)s - %(message)s"
+    # Formatters - ANSI colors only when the console is a terminal
     file_format = "%(levelname)s %(asctime)s [%(name)s] %(filename)s:%(lineno)d - %(message)s"
     
-    console_formatter = ColoredFormatter(
-        console_format,
-        datefmt="%H:%M:%S"
-    )
+    if sys.stdout.isatty():
+        console_formatter = ColoredFormatter(
+            "%(level_colored)s %(asctime)s - %(message)s",
+            datefmt="%H:%M:%S"
+        )
+    else:
+        console_formatter = logging.Formatter(
+            "%(levelname)s %(asctime)s - %(message)s",
+            datefmt="%H:%M:%S"
+        )
     
     file_formatter = logging.Formatter(
         file_format,
@@ -102,9 +155,17 @@ def setup_logger(name="OTTOMAT3D", log_level=logging.INFO):
     console_handler.setFormatter(console_formatter)
     file_handler.setFormatter(file_formatter)
     
-    # Add handlers
+    # Add handlers - the file handler runs on a background listener thread so
+    # callers only pay for a queue put; the console stays inline to keep its
+    # output in order with print()
+    log_queue = queue.SimpleQueue()
+    listener = _DrainFlushQueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # drain queued records before logging shuts down
+    logger._listener = listener
+    
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     # Log the start of session
     logger.info(f"OTTOMAT3D logging started - Log file: {log_file}")
@@ -125,6 +186,9 @@ def log_function_call(func):
             raise
     return wrapper
 
+# Rule line around job start/complete messages
+_JOB_RULE = "=" * 60
+
 class StatusLogger:
     """Helper class for logging printer and device status"""
     
@@ -134,7 +198,11 @@ class StatusLogger:
     def log_printer_status(self, printer_name, status_data):
         """Log printer status in structured format"""
         if not status_data:
-            self.logger.warning(f"{printer_name}: No status data available")
+            self.logger.warning("%s: No status data available", printer_name)
+            return
+        
+        # Skip building the status line when INFO is filtered out
+        if not self.logger.isEnabledFor(logging.INFO):
             return
         
         # Extract common status fields
@@ -148,53 +216,64 @@ class StatusLogger:
             progress_str = "N/A"
         
         # Log main status
-        status_msg = f"{printer_name}: {state} | Progress: {progress_str}"
+        status_msg = "%s: %s | Progress: %s"
+        args = [printer_name, state, progress_str]
         
         # Add additional info if available
         if 'current_stage' in status_data:
-            status_msg += f" | Stage: {status_data['current_stage']}"
+            status_msg += " | Stage: %s"
+            args.append(status_data['current_stage'])
         
         if 'remaining_time_minutes' in status_data:
             remaining = status_data['remaining_time_minutes']
             if remaining is not None:
-                status_msg += f" | Remaining: {remaining} min"
+                status_msg += " | Remaining: %s min"
+                args.append(remaining)
         
-        self.logger.info(status_msg)
+        self.logger.info(status_msg, *args)
     
     def log_ottoeject_status(self, device_name, status_data):
         """Log OttoEject status in structured format"""
         if not status_data:
-            self.logger.warning(f"{device_name}: No status data available")
+            self.logger.warning("%s: No status data available", device_name)
             return
         
-        state = status_data.get('status', status_data.get('state', 'UNKNOWN')).upper()
-        self.logger.info(f"{device_name}: {state}")
+        if self.logger.isEnabledFor(logging.INFO):
+            state = status_data.get('status', status_data.get('state', 'UNKNOWN')).upper()
+            self.logger.info("%s: %s", device_name, state)
     
     def log_job_start(self, job_num, total_jobs, filename):
         """Log the start of a print job"""
-        self.logger.info("=" * 60)
-        self.logger.info(f"🚀 STARTING JOB {job_num}/{total_jobs}: {filename}")
-        self.logger.info("=" * 60)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(_JOB_RULE)
+            self.logger.info("🚀 STARTING JOB %s/%s: %s", job_num, total_jobs, filename)
+            self.logger.info(_JOB_RULE)
     
     def log_job_complete(self, job_num, total_jobs, filename):
         """Log the completion of a print job"""
-        self.logger.info("=" * 60)
-        self.logger.info(f"✅ COMPLETED JOB {job_num}/{total_jobs}: {filename}")
-        self.logger.info("=" * 60)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(_JOB_RULE)
+            self.logger.info("✅ COMPLETED JOB %s/%s: %s", job_num, total_jobs, filename)
+            self.logger.info(_JOB_RULE)
     
     def log_ejection_start(self, store_slot, grab_slot=None):
         """Log the start of ejection sequence"""
         if grab_slot:
-            self.logger.info(f"🔄 EJECTION SEQUENCE: Store→{store_slot}, Grab→{grab_slot}")
+            self.logger.info("🔄 EJECTION SEQUENCE: Store→%s, Grab→%s", store_slot, grab_slot)
         else:
-            self.logger.info(f"🔄 EJECTION SEQUENCE: Store→{store_slot} (Final job)")
+            self.logger.info("🔄 EJECTION SEQUENCE: Store→%s (Final job)", store_slot)
     
     def log_macro_execution(self, macro_name, success=True):
         """Log macro execution result"""
         if success:
-            self.logger.info(f"✅ Macro executed: {macro_name}")
+            self.logger.info("✅ Macro executed: %s", macro_name)
         else:
-            self.logger.error(f"❌ Macro failed: {macro_name}")
+            self.logger.error("❌ Macro failed: %s", macro_name)
+
+@functools.lru_cache(maxsize=None)
+def get_status_logger(logger_name="OTTOMAT3D"):
+    """Get the shared StatusLogger for a logger name (created once per session)"""
+    return StatusLogger(logger_name)
 
 def cleanup_old_logs(max_days=2):
     """Clean up log files older than specified days"""
@@ -211,7 +290,6 @@ def cleanup_old_logs(max_days=2):
     if not logs_dir.exists():
         return 0
     
-    import time
     current_time = time.time()
     max_age = max_days * 24 * 60 * 60  # Convert days to seconds
     
@@ -219,13 +297,16 @@ def cleanup_old_logs(max_days=2):
     print("🧹 Cleaning up old log files...")
     
     deleted_count = 0
-    # Updated glob pattern to match new naming format: YYYY_MM_DD_HH_MM.log
-    for log_file in logs_dir.glob("*.log"):
-        file_age = current_time - log_file.stat().st_mtime
-        if file_age > max_age:
+    # Log files are named YYYY_MM_DD_HH_MM.log; scandir entries reuse the
+    # directory listing's stat data where the platform provides it
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".log"):
+                continue
             try:
-                log_file.unlink()
-                deleted_count += 1
+                if current_time - entry.stat().st_mtime > max_age:
+                    os.unlink(entry.path)
+                    deleted_count += 1
             except OSError:
                 pass  # File might be in use
     
@@ -3,6 +3,129 @@ Macro Utilities for OTTOMAT3D
 Provides default macro mappings for different printer brands and models
 """
 
+import functools
+from types import MappingProxyType
+
+def _freeze(mapping):
+    """Wrap a nested dict in read-only MappingProxyType views"""
+    return MappingProxyType({
+        key: _freeze(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+# Default macro mappings for each printer brand and model
+PRINTER_MACROS = _freeze({
+    "Bambu Lab": {
+        "P1P": {
+            "EJECT_MACRO": "EJECT_FROM_BAMBULAB_P_ONE_P",
+            "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_P_ONE_P"
+        },
+        "P1S": {
+            "EJECT_MACRO": "EJECT_FROM_BAMBULAB_P_ONE_S", 
+            "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_P_ONE_S"
+        },
+        "A1": {
+            "EJECT_MACRO": "EJECT_FROM_BAMBULAB_A_ONE",
+            "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_A_ONE"
+        },
+        "X1C": {
+            "EJECT_MACRO": "EJECT_FROM_BAMBULAB_X_ONE_C",
+            "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_X_ONE_C"
+        }
+    },
+    "Elegoo": {
+        "Centauri Carbon": {
+            "EJECT_MACRO": "EJECT_FROM_ELEGOO_CC",
+            "LOAD_MACRO": "LOAD_ONTO_ELEGOO_CC"
+        }
+    },
+    "Creality": {
+        "K1": {
+            "EJECT_MACRO": "EJECT_FROM_CREALITY_K_ONE_C",
+            "LOAD_MACRO": "LOAD_ONTO_CREALITY_K_ONE_C"
+        },
+        "K1C": {
+            "EJECT_MACRO": "EJECT_FROM_CREALITY_K_ONE_C",
+            "LOAD_MACRO": "LOAD_ONTO_CREALITY_K_ONE_C"
+        }
+    },
+    "FlashForge": {
+        "AD5X": {
+            "EJECT_MACRO": "EJECT_FROM_FLASHFORGE_AD_FIVE_X",
+            "LOAD_MACRO": "LOAD_ONTO_FLASHFORGE_AD_FIVE_X"
+        },
+        "5M Pro": {
+            "EJECT_MACRO": "EJECT_FROM_FLASHFORGE_AD_FIVE_X",  # Same as AD5X
+            "LOAD_MACRO": "LOAD_ONTO_FLASHFORGE_AD_FIVE_X"
+        }
+    },
+    "Prusa": {
+        "MK3": {
+            "EJECT_MACRO": "EJECT_FROM_PRUSA_MK_THREE",
+            "LOAD_MACRO": "LOAD_ONTO_PRUSA_MK_THREE"
+        },
+        "MK4": {
+            "EJECT_MACRO": "EJECT_FROM_PRUSA_MK_FOUR",
+            "LOAD_MACRO": "LOAD_ONTO_PRUSA_MK_FOUR"
+        },
+        "Core One": {
+            "EJECT_MACRO": "EJECT_FROM_PRUSA_CORE_ONE",
+            "LOAD_MACRO": "LOAD_ONTO_PRUSA_CORE_ONE"
+        }
+    },
+    "Anycubic": {
+        "Kobra S1": {
+            "EJECT_MACRO": "EJECT_FROM_ANYCUBIC_KOBRA_S_ONE",
+            "LOAD_MACRO": "LOAD_ONTO_ANYCUBIC_KOBRA_S_ONE"
+        }
+    }
+})
+
+# Mapping of printer models that have doors to their door closing macros
+# Handle all possible model name variations
+DOOR_CLOSING_MACROS = _freeze({
+    "Bambu Lab": {
+        "P1S": "CLOSE_DOOR_BAMBULAB_P_ONE_S",
+        "X1C": "CLOSE_DOOR_BAMBULAB_X_ONE_C"
+    },
+    "Creality": {
+        "K1": "CLOSE_DOOR_CREALITY_K_ONE_C",
+        "K1C": "CLOSE_DOOR_CREALITY_K_ONE_C", 
+        "K1/K1C": "CLOSE_DOOR_CREALITY_K_ONE_C"  # Handle the combined model name
+    },
+    "Anycubic": {
+        "Kobra S1": "CLOSE_DOOR_ANYCUBIC_KOBRA_S_ONE"
+    },
+    "Elegoo": {
+        "Centauri Carbon": "CLOSE_DOOR_ELEGOO_CC"
+    }
+})
+
+# Valid macro names start with one of these prefixes
+_VALID_PREFIXES = ("EJECT_FROM_", "LOAD_ONTO_", "CLOSE_DOOR_")
+
+# Flat lookups keyed by (brand, model), built once from the tables above
+_MACROS = {
+    (brand, model): macros
+    for brand, models in PRINTER_MACROS.items()
+    for model, macros in models.items()
+}
+_DOORS = {
+    (brand, model): macro
+    for brand, models in DOOR_CLOSING_MACROS.items()
+    for model, macro in models.items()
+}
+
+# Example models for each brand listed by get_all_supported_macros (you can expand this)
+_EXAMPLE_MODELS = {
+    "Bambu Lab": ("P1P", "P1S", "A1", "X1C"),
+    "Elegoo": ("Centauri Carbon",),
+    "Creality": ("K1", "K1C"),
+    "FlashForge": ("AD5X", "5M Pro"),
+    "Prusa": ("MK3", "MK4", "Core One"),
+    "Anycubic": ("Kobra S1",)
+}
+
 def get_default_macros(printer_brand, printer_model):
     """
     Get default eject and load macro names for a specific printer
@@ -14,89 +137,23 @@ def get_default_macros(printer_brand, printer_model):
     Returns:
         dict: Contains 'EJECT_MACRO' and 'LOAD_MACRO' keys with default values
     """
+    macros = _MACROS.get((printer_brand, printer_model))
+    if macros is None:
+        macros = _generic_macros(printer_brand, printer_model)
     
-    # Default macro mappings for each printer brand and model
-    PRINTER_MACROS = {
-        "Bambu Lab": {
-            "P1P": {
-                "EJECT_MACRO": "EJECT_FROM_BAMBULAB_P_ONE_P",
-                "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_P_ONE_P"
-            },
-            "P1S": {
-                "EJECT_MACRO": "EJECT_FROM_BAMBULAB_P_ONE_S", 
-                "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_P_ONE_S"
-            },
-            "A1": {
-                "EJECT_MACRO": "EJECT_FROM_BAMBULAB_A_ONE",
-                "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_A_ONE"
-            },
-            "X1C": {
-                "EJECT_MACRO": "EJECT_FROM_BAMBULAB_X_ONE_C",
-                "LOAD_MACRO": "LOAD_ONTO_BAMBULAB_X_ONE_C"
-            }
-        },
-        "Elegoo": {
-            "Centauri Carbon": {
-                "EJECT_MACRO": "EJECT_FROM_ELEGOO_CC",
-                "LOAD_MACRO": "LOAD_ONTO_ELEGOO_CC"
-            }
-        },
-        "Creality": {
-            "K1": {
-                "EJECT_MACRO": "EJECT_FROM_CREALITY_K_ONE_C",
-                "LOAD_MACRO": "LOAD_ONTO_CREALITY_K_ONE_C"
-            },
-            "K1C": {
-                "EJECT_MACRO": "EJECT_FROM_CREALITY_K_ONE_C",
-                "LOAD_MACRO": "LOAD_ONTO_CREALITY_K_ONE_C"
-            }
-        },
-        "FlashForge": {
-            "AD5X": {
-                "EJECT_MACRO": "EJECT_FROM_FLASHFORGE_AD_FIVE_X",
-                "LOAD_MACRO": "LOAD_ONTO_FLASHFORGE_AD_FIVE_X"
-            },
-            "5M Pro": {
-                "EJECT_MACRO": "EJECT_FROM_FLASHFORGE_AD_FIVE_X",  # Same as AD5X
-                "LOAD_MACRO": "LOAD_ONTO_FLASHFORGE_AD_FIVE_X"
-            }
-        },
-        "Prusa": {
-            "MK3": {
-                "EJECT_MACRO": "EJECT_FROM_PRUSA_MK_THREE",
-                "LOAD_MACRO": "LOAD_ONTO_PRUSA_MK_THREE"
-            },
-            "MK4": {
-                "EJECT_MACRO": "EJECT_FROM_PRUSA_MK_FOUR",
-                "LOAD_MACRO": "LOAD_ONTO_PRUSA_MK_FOUR"
-            },
-            "Core One": {
-                "EJECT_MACRO": "EJECT_FROM_PRUSA_CORE_ONE",
-                "LOAD_MACRO": "LOAD_ONTO_PRUSA_CORE_ONE"
-            }
-        },
-        "Anycubic": {
-            "Kobra S1": {
-                "EJECT_MACRO": "EJECT_FROM_ANYCUBIC_KOBRA_S_ONE",
-                "LOAD_MACRO": "LOAD_ONTO_ANYCUBIC_KOBRA_S_ONE"
-            }
-        }
-    }
-    
-    # Get macros for the specific brand and model
-    if printer_brand in PRINTER_MACROS:
-        brand_macros = PRINTER_MACROS[printer_brand]
-        if printer_model in brand_macros:
-            return brand_macros[printer_model].copy()
-    
-    # Fallback: generate generic macros if not found
+    # Callers may modify the result, so each call gets its own dict
+    return dict(macros)
+
+@functools.lru_cache(maxsize=256)
+def _generic_macros(printer_brand, printer_model):
+    """Fallback macro names for a printer missing from PRINTER_MACROS"""
     brand_clean = printer_brand.upper().replace(' ', '_')
     model_clean = printer_model.upper().replace(' ', '_').replace('/', '_')
     
-    return {
+    return MappingProxyType({
         "EJECT_MACRO": f"EJECT_FROM_{brand_clean}_{model_clean}",
         "LOAD_MACRO": f"LOAD_ONTO_{brand_clean}_{model_clean}"
-    }
+    })
 
 def get_all_supported_macros():
     """
@@ -105,25 +162,10 @@ def get_all_supported_macros():
     Returns:
         dict: Complete mapping of all supported combinations
     """
-    brands = ["Bambu Lab", "Elegoo", "Creality", "FlashForge", "Prusa", "Anycubic"]
-    all_macros = {}
-    
-    # Example models for each brand (you can expand this)
-    example_models = {
-        "Bambu Lab": ["P1P", "P1S", "A1", "X1C"],
-        "Elegoo": ["Centauri Carbon"],
-        "Creality": ["K1", "K1C"],
-        "FlashForge": ["AD5X", "5M Pro"],
-        "Prusa": ["MK3", "MK4", "Core One"],
-        "Anycubic": ["Kobra S1"]
+    return {
+        brand: {model: get_default_macros(brand, model) for model in models}
+        for brand, models in _EXAMPLE_MODELS.items()
     }
-    
-    for brand in brands:
-        all_macros[brand] = {}
-        for model in example_models.get(brand, []):
-            all_macros[brand][model] = get_default_macros(brand, model)
-    
-    return all_macros
 
 def get_door_closing_macro(printer_brand, printer_model):
     """
@@ -136,33 +178,7 @@ def get_door_closing_macro(printer_brand, printer_model):
     Returns:
         str: Door closing macro name, or None if printer doesn't have a door
     """
-    
-    # Mapping of printer models that have doors to their door closing macros
-    # Handle all possible model name variations
-    DOOR_CLOSING_MACROS = {
-        "Bambu Lab": {
-            "P1S": "CLOSE_DOOR_BAMBULAB_P_ONE_S",
-            "X1C": "CLOSE_DOOR_BAMBULAB_X_ONE_C"
-        },
-        "Creality": {
-            "K1": "CLOSE_DOOR_CREALITY_K_ONE_C",
-            "K1C": "CLOSE_DOOR_CREALITY_K_ONE_C", 
-            "K1/K1C": "CLOSE_DOOR_CREALITY_K_ONE_C"  # Handle the combined model name
-        },
-        "Anycubic": {
-            "Kobra S1": "CLOSE_DOOR_ANYCUBIC_KOBRA_S_ONE"
-        },
-        "Elegoo": {
-            "Centauri Carbon": "CLOSE_DOOR_ELEGOO_CC"
-        }
-    }
-    
-    if printer_brand in DOOR_CLOSING_MACROS:
-        brand_macros = DOOR_CLOSING_MACROS[printer_brand]
-        if printer_model in brand_macros:
-            return brand_macros[printer_model]
-    
-    return None
+    return _DOORS.get((printer_brand, printer_model))
 
 def has_door(printer_brand, printer_model):
     """
@@ -175,7 +191,7 @@ def has_door(printer_brand, printer_model):
     Returns:
         bool: True if printer has a door, False otherwise
     """
-    return get_door_closing_macro(printer_brand, printer_model) is not None
+    return (printer_brand, printer_model) in _DOORS
 
 def validate_macro_name(macro_name):
     """
@@ -190,10 +206,7 @@ def validate_macro_name(macro_name):
     if not macro_name:
         return False
     
-    # Should start with EJECT_FROM_, LOAD_ONTO_, or CLOSE_DOOR_
-    valid_prefixes = ["EJECT_FROM_", "LOAD_ONTO_", "CLOSE_DOOR_"]
-    
-    return any(macro_name.startswith(prefix) for prefix in valid_prefixes)
+    return macro_name.startswith(_VALID_PREFIXES)
 
 def test_door_closing_macros():
     """
@@ -7,40 +7,44 @@ class RackManager:
     def __init__(self, total_slots=6):
         """Initialize rack manager with specified number of slots"""
         self.total_slots = total_slots
+        self._record_log = False
         self.reset_rack()
     
     def reset_rack(self, slot_count=None):
         """Reset rack to initial state (all slots empty)"""
         effective_slot_count = slot_count if slot_count is not None else self.total_slots
-        self.rack_state = {i: "empty" for i in range(1, effective_slot_count + 1)}
+        # Slot contents by slot index (slot 1 is index 0); None marks an empty slot
+        self.slot_contents = [None] * effective_slot_count
         self.simulation_log = []
     
-    def validate_job_sequence(self, jobs, initial_rack_state=None, slot_count=None):
+    def validate_job_sequence(self, jobs, initial_rack_state=None, slot_count=None, record=False):
         """
         Validate a complete job sequence for rack conflicts
         
         Args:
-            jobs: Dict of job configurations {job_num: {filename, store_slot, grab_slot}}
+            jobs: Sequence of jobs (filename, store_slot, grab_slot attributes) in run order
             initial_rack_state: Optional dict of initial rack state {slot: content}
             slot_count: Number of rack slots to use (overrides self.total_slots)
+            record: Fill simulation_log for get_simulation_summary (off by default)
         
         Returns:
             Dict with 'valid' boolean and 'error' message if invalid
         """
         # Use provided slot count or default to instance value
         effective_slot_count = slot_count if slot_count is not None else self.total_slots
+        self._record_log = record
         
         # Set initial rack state (either provided or reset to empty)
+        self.reset_rack(effective_slot_count)
         if initial_rack_state is not None:
-            self.rack_state = initial_rack_state.copy()
-            self.simulation_log = []
-        else:
-            self.reset_rack(effective_slot_count)
-        
-        for job_num in sorted(jobs.keys()):
-            job = jobs[job_num]
-            store_slot = job['store_slot']
-            grab_slot = job.get('grab_slot')
+            for slot, content in initial_rack_state.items():
+                if content != "empty" and self._is_valid_slot(slot, effective_slot_count):
+                    self.slot_contents[slot - 1] = content
+        slot_contents = self.slot_contents
+        
+        for job_num, job in enumerate(jobs, 1):
+            store_slot = job.store_slot
+            grab_slot = job.grab_slot
             
             # Validate store slot
             if not self._is_valid_slot(store_slot, effective_slot_count):
@@ -49,10 +53,10 @@ class RackManager:
                     'error': f"Job {job_num}: Invalid store slot {store_slot} (must be 1-{effective_slot_count})"
                 }
             
-            if self.rack_state[store_slot] != "empty":
+            if slot_contents[store_slot - 1] is not None:
                 return {
                     'valid': False,
-                    'error': f"Job {job_num}: Cannot store to slot {store_slot} - already occupied by {self.rack_state[store_slot]}"
+                    'error': f"Job {job_num}: Cannot store to slot {store_slot} - already occupied by {slot_contents[store_slot - 1]}"
                 }
             
             # Validate grab slot if specified
@@ -63,7 +67,7 @@ class RackManager:
                         'error': f"Job {job_num}: Invalid grab slot {grab_slot} (must be 1-{effective_slot_count})"
                     }
                 
-                if self.rack_state[grab_slot] == "empty":
+                if slot_contents[grab_slot - 1] is None:
                     return {
                         'valid': False,
                         'error': f"Job {job_num}: Cannot grab from slot {grab_slot} - slot is empty"
@@ -76,25 +80,30 @@ class RackManager:
     
     def _simulate_job(self, job_num, job):
         """Simulate a single job execution on the rack"""
-        store_slot = job['store_slot']
-        grab_slot = job.get('grab_slot')
-        filename = job['filename']
+        store_slot = job.store_slot
+        grab_slot = job.grab_slot
+        filename = job.filename
+        record = self._record_log
         
         # Record initial state
-        initial_state = self.rack_state.copy()
+        if record:
+            initial_state = tuple(self.slot_contents)
         
         # Grab plate if needed (this empties the slot)
         if grab_slot is not None:
-            self.rack_state[grab_slot] = "empty"
-            self.simulation_log.append({
-                'job': job_num,
-                'action': 'grab',
-                'slot': grab_slot,
-                'description': f"Grabbed plate from slot {grab_slot}"
-            })
+            self.slot_contents[grab_slot - 1] = None
+            if record:
+                self.simulation_log.append({
+                    'job': job_num,
+                    'action': 'grab',
+                    'slot': grab_slot,
+                    'description': f"Grabbed plate from slot {grab_slot}"
+                })
         
         # Store completed print (this occupies the slot)
-        self.rack_state[store_slot] = f"job_{job_num}_{filename}"
+        self.slot_contents[store_slot - 1] = f"job_{job_num}_{filename}"
+        if not record:
+            return
         self.simulation_log.append({
             'job': job_num,
             'action': 'store',
@@ -107,7 +116,7 @@ class RackManager:
             'job': job_num,
             'action': 'state',
             'before': initial_state,
-            'after': self.rack_state.copy(),
+            'after': tuple(self.slot_contents),
             'description': f"Rack state after Job {job_num}"
         })
     
@@ -137,11 +146,10 @@ class RackManager:
         return "\n".join(summary)
     
     def _format_rack_state(self, state):
-        """Format rack state for display"""
+        """Format a rack state snapshot (slot contents in slot order) for display"""
         formatted = []
-        for slot in range(1, self.total_slots + 1):
-            content = state[slot]
-            if content == "empty":
+        for slot, content in enumerate(state, 1):
+            if content is None:
                 formatted.append(f"Slot {slot}: Empty")
             else:
                 formatted.append(f"Slot {slot}: {content}")
@@ -149,7 +157,7 @@ class RackManager:
     
     def check_final_rack_utilization(self):
         """Check how efficiently the rack is used"""
-        occupied_slots = sum(1 for state in self.rack_state.values() if state != "empty")
+        occupied_slots = len(self.slot_contents) - self.slot_contents.count(None)
         utilization = (occupied_slots / self.total_slots) * 100
         
         return {
@@ -163,12 +171,14 @@ class RackManager:
         """Suggest rack slot optimizations"""
         suggestions = []
         
-        # Check for inefficient slot usage
-        used_slots = set()
-        for job in jobs.values():
-            if job.get('grab_slot'):
-                used_slots.add(job['grab_slot'])
-            used_slots.add(job['store_slot'])
+        # Collect store and grab slots in one pass over the jobs
+        store_slots = set()
+        grab_slots = set()
+        for job in jobs:
+            store_slots.add(job.store_slot)
+            if job.grab_slot:
+                grab_slots.add(job.grab_slot)
+        used_slots = store_slots | grab_slots
         
         # Suggest using consecutive slots for better organization
         if used_slots:
@@ -181,11 +191,8 @@ class RackManager:
                 )
         
         # Check for potential deadlocks
-        store_slots = {job['store_slot'] for job in jobs.values()}
-        grab_slots = {job.get('grab_slot') for job in jobs.values() if job.get('grab_slot')}
-        
-        if store_slots & grab_slots:
-            overlapping = store_slots & grab_slots
+        overlapping = store_slots & grab_slots
+        if overlapping:
             suggestions.append(
                 f"Slots {overlapping} are used for both storing and grabbing. "
                 "Ensure timing is correct to avoid conflicts."
@@ -198,9 +205,8 @@ class RackManager:
         print("\nRACK VISUALIZATION:")
         print("=" * 50)
         
-        for slot in range(1, self.total_slots + 1):
-            content = self.rack_state[slot]
-            if content == "empty":
+        for slot, content in enumerate(self.slot_contents, 1):
+            if content is None:
                 status = "[ EMPTY ]"
             else:
                 status = f"[{content[:8]}...]" if len(content) > 10 else f"[{content}]"